@@ -1,26 +1,35 @@
 # Module: manager.py
 # Purpose: Real file management for test cases
 
-import json
 import os
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 
+from utils.helpers import load_json_file, JSON_DECODE_ERRORS
+
 class TestFileManager:
+    # Parsed files kept for re-selection; the oldest entry is dropped beyond this
+    PARSE_CACHE_SIZE = 64
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self._parse_cache: Dict[str, Tuple[int, int, Any]] = {}  # path -> (mtime_ns, size, data)
     
-    def validate_json_file(self, file_path: str) -> Tuple[bool, str, Optional[Dict]]:
+    def validate_json_file(self, file_path: str, file_stat: Optional[os.stat_result] = None) -> Tuple[bool, str, Optional[Dict]]:
         """
         Validate a JSON test case file
+        file_stat may be passed by callers that already stat'ed the file
         Returns: (is_valid, error_message, parsed_data)
         """
         try:
             # Check file exists and size
-            if not os.path.exists(file_path):
-                return False, "File does not exist", None
+            if file_stat is None:
+                try:
+                    file_stat = os.stat(file_path)
+                except FileNotFoundError:
+                    return False, "File does not exist", None
             
-            file_size = os.path.getsize(file_path)
+            file_size = file_stat.st_size
             if file_size > 1024 * 1024:  # 1MB limit
                 return False, "File size exceeds 1MB limit", None
             
@@ -28,8 +37,7 @@ class TestFileManager:
                 return False, "File is empty", None
             
             # Parse JSON
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = self._parse_json_file(file_path, file_stat)
             
             # Validate structure
             if not isinstance(data, dict):
@@ -60,11 +68,28 @@ class TestFileManager:
             self.logger.info(f"File validation successful: {file_path}")
             return True, "", data
             
-        except json.JSONDecodeError as e:
+        except JSON_DECODE_ERRORS as e:
             return False, f"Invalid JSON format: {e}", None
         except Exception as e:
             return False, f"File validation error: {e}", None
     
+    def _parse_json_file(self, file_path: str, file_stat: os.stat_result) -> Any:
+        """Parse a JSON file, reusing the previous result while mtime and size are unchanged"""
+        cached = self._parse_cache.get(file_path)
+        if cached and cached[0] == file_stat.st_mtime_ns and cached[1] == file_stat.st_size:
+            return cached[2]
+        
+        data = load_json_file(file_path)
+        
+        self._parse_cache.pop(file_path, None)  # Re-insert so dict order tracks recency
+        self._parse_cache[file_path] = (file_stat.st_mtime_ns, file_stat.st_size, data)
+        if len(self._parse_cache) > self.PARSE_CACHE_SIZE:
+            try:
+                del self._parse_cache[next(iter(self._parse_cache))]
+            except (KeyError, StopIteration, RuntimeError):
+                pass  # Another loader thread changed the cache first
+        return data
+    
     def analyze_test_impacts(self, data: Dict[str, Any]) -> Dict[str, bool]:
         """
         Analyze test cases to determine network impacts
@@ -7,13 +7,20 @@
 
 import os
 import sys
-import json
+import csv
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
+import queue
+import random
+import re
+import shlex
 import time
 import logging
-from typing import Optional, Tuple, List, Dict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional, Tuple, List, Dict, Set
 
 # Import các module thực tế
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
@@ -21,16 +28,36 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 from network.connection import SSHConnection
 from files.manager import TestFileManager
 from storage.database import TestDatabase
+from utils.helpers import load_json_file, format_file_size, timestamp_parts
 
 # Configuration constants
 class AppConfig:
     DEFAULT_TIMEOUT = 120
     RESULT_CHECK_INTERVAL = 3
+    RESULT_RESCAN_INTERVAL = 30  # Seconds between directory scans while a watch is running
     MAX_RECONNECT_ATTEMPTS = 3
     CONNECTION_RETRY_DELAY = 2
+    MAX_RETRY_DELAY = 30  # Cap for exponential reconnect backoff
+    CONNECTION_TEST_DEADLINE = 60  # Seconds a connection test may spend retrying
+    CONNECTION_CACHE_TTL = 30  # Seconds a verified connection skips re-testing
     FILE_SIZE_THRESHOLD = 50
+    SETTLED_FILE_MAX_SIZE = 64 * 1024  # Results up to this size are written in one go...
+    SETTLED_FILE_AGE = 2.0  # ...so once unmodified this long (whole-second mtimes) they're final
+    APP_LOG_TAIL_BYTES = 256 * 1024  # End of application.log searched for result file names
     TEMP_CLEANUP_HOURS = 1
+    TEMP_RESULTS_DIR = "data/temp/results"
     MAX_FILE_RETRIES = 2
+    MAX_LOG_LINES = 50000
+    MAX_LOG_WIDGET_LINES = 5000  # Lines kept in the log widget; export uses the longer in-memory log
+    LOG_TRIM_BATCH = 500  # Extra lines allowed before the widget is trimmed in one delete
+    LOG_FLUSH_INTERVAL_MS = 50
+    DETAIL_LOAD_THRESHOLD = 0.9  # Scroll fraction at which more detail rows are rendered
+    IO_WORKERS = 2
+    DETAIL_INSERT_CHUNK = 50
+    TOAST_DURATION_MS = 3000
+    CLOCK_ICONIFIED_INTERVAL_MS = 5000
+    SETTINGS_SAVE_DELAY_MS = 500  # Idle time after the last edit before settings are written
+    HISTORY_LIMIT = 100  # Rows shown in the history table
     
     # File patterns
     RESULT_FILE_PATTERN = "{base}_*.json"
@@ -41,6 +68,35 @@ class AppConfig:
     COMMAND_TIMEOUT = 30
 
 class ApplicationGUI:
+    # Status indicator colors
+    COLOR_MAP = {
+        "green": "#00AA00",    # Success
+        "yellow": "#FFB000",   # Warning/Connecting
+        "red": "#CC0000",      # Error
+        "gray": "#808080"      # Disabled
+    }
+    
+    # Suffix for history details of runs that touched WAN/LAN
+    NETWORK_AFFECTING_NOTE = "(Network affecting)"
+    
+    # Dotted-quad IPv4 address with each octet in 0-255 (leading zeros allowed)
+    IP_PATTERN = re.compile(r"0*(?:25[0-5]|2[0-4][0-9]|1?[0-9]?[0-9])(?:\.0*(?:25[0-5]|2[0-4][0-9]|1?[0-9]?[0-9])){3}")
+    
+    # Error message fragments that mark a file as worth retrying
+    RETRYABLE_ERRORS = (
+        "timeout",
+        "connection lost",
+        "network",
+        "ssh",
+        "broken pipe",
+        "connection refused",
+        "no route to host"
+    )
+    
+    # Log line written by the router app when it saves a result file; {name} is an escaped base name.
+    # Compiled once per result wait, since the name differs per file
+    RESULT_LOG_TEMPLATE = r'Successfully wrote .* bytes to file result/([^/\s]*{name}[^/\s]*\.json)'
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Test Case Manager v2.0")
@@ -66,14 +122,41 @@ class ApplicationGUI:
         self.current_file_index = -1
         self.processing = False
         self.file_retry_count = {}  # Track retry attempts per file
+        self._file_items = ()  # file_table item IDs snapshotted when sending
+        self._status_buffer = deque()  # (item_id, changes) for file_table, filled from the worker thread
+        self._status_flush_scheduled = False
+        self._log_lines = deque(maxlen=AppConfig.MAX_LOG_LINES)  # Mirror of log_text for export
+        self._log_buffer = deque()  # Entries waiting to be written to log_text, filled from any thread
+        self._log_widget_lines = 0  # Lines currently in log_text
+        self._io_pool = ThreadPoolExecutor(max_workers=AppConfig.IO_WORKERS)  # Off-UI-thread file parsing
+        self._file_load_generation = 0  # Bumped to discard results of superseded file loads
+        self._pending_file_loads = 0
+        self._dirty_settings = {}  # Setting name -> variable edited since the last auto-save
+        self._settings_save_id = None  # Pending auto-save after() id
+        self._temp_dir_scanned = False  # Set after the one-time sweep for untracked temp files
+        self._cancel_event = threading.Event()  # Set on cancel/close to cut retry waits short
+        self._listing_cache = {}  # result_dir -> (monotonic time, listing) during a result wait
+        self._app_log_tail = ""  # End of the router's application.log, extended as it grows
+        self._app_log_offset = None  # Byte offset in the log just past _app_log_tail
+        
+        # Persistent worker that runs SSH jobs one at a time
+        self._jobs = queue.Queue()
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True, name="ssh-worker")
+        self._worker.start()
+        self._detail_test_cases = []  # Test cases of the file shown in detail_table
+        self._detail_results = []  # Results for those test cases, once available
+        self._detail_loaded = 0  # Number of detail rows rendered so far
+        self._detail_file_index = -1  # Index of the file shown in detail_table
+        self._detail_load_scheduled = False
         
         # Create UI components
         self.create_menu()
         self.create_notebook()
         self.create_status_bar()
+        self._flush_log_buffer()  # Starts the periodic log flush timer
         
-        # Load history from database
-        self.load_history()
+        # Load history from database once the window has been drawn
+        self.root.after_idle(self.load_history)
         
         # Auto-save settings when changed
         self.setup_auto_save()
@@ -111,22 +194,29 @@ class ApplicationGUI:
     
     def setup_variables(self):
         """Setup and load variables from database"""
-        self.lan_ip_var = tk.StringVar(value=self.database.get_setting("lan_ip", "192.168.88.1"))
-        self.wan_ip_var = tk.StringVar(value=self.database.get_setting("wan_ip", ""))
-        self.username_var = tk.StringVar(value=self.database.get_setting("username", "root"))
+        settings = self.database.get_settings()  # One query instead of one per field
+        self.lan_ip_var = tk.StringVar(value=settings.get("lan_ip", "192.168.88.1"))
+        self.wan_ip_var = tk.StringVar(value=settings.get("wan_ip", ""))
+        self.username_var = tk.StringVar(value=settings.get("username", "root"))
         self.password_var = tk.StringVar()  # Never save password
-        self.config_path_var = tk.StringVar(value=self.database.get_setting("config_path", "/root/config"))
-        self.result_path_var = tk.StringVar(value=self.database.get_setting("result_path", "/root/result"))
+        self.config_path_var = tk.StringVar(value=settings.get("config_path", "/root/config"))
+        self.result_path_var = tk.StringVar(value=settings.get("result_path", "/root/result"))
         self.connection_status = tk.StringVar(value="Not Connected")
+        
+        # Any change to connection fields invalidates a cached successful test
+        self._connection_verified_until = 0.0
+        for var in (self.lan_ip_var, self.wan_ip_var, self.username_var, self.password_var,
+                    self.config_path_var, self.result_path_var):
+            var.trace_add("write", self._invalidate_connection_cache)
     
     def setup_auto_save(self):
-        """Setup auto-save for settings when they change"""
+        """Setup auto-save for settings when they change; edits are written after a short idle delay"""
         def save_setting(var_name, var):
             def callback(*args):
-                try:
-                    self.database.save_setting(var_name, var.get())
-                except Exception as e:
-                    self.logger.warning(f"Auto-save failed for {var_name}: {e}")
+                self._dirty_settings[var_name] = var
+                if self._settings_save_id is not None:
+                    self.root.after_cancel(self._settings_save_id)
+                self._settings_save_id = self.root.after(AppConfig.SETTINGS_SAVE_DELAY_MS, self._flush_pending_settings)
             return callback
         
         self.lan_ip_var.trace('w', save_setting('lan_ip', self.lan_ip_var))
@@ -135,11 +225,40 @@ class ApplicationGUI:
         self.config_path_var.trace('w', save_setting('config_path', self.config_path_var))
         self.result_path_var.trace('w', save_setting('result_path', self.result_path_var))
     
+    def _flush_pending_settings(self):
+        """Write all settings edited since the last flush in one transaction"""
+        self._settings_save_id = None
+        if not self._dirty_settings:
+            return
+        
+        settings = {name: var.get() for name, var in self._dirty_settings.items()}
+        self._dirty_settings.clear()
+        try:
+            self.database.save_settings(settings)
+        except Exception as e:
+            self.logger.warning(f"Auto-save failed for {', '.join(settings)}: {e}")
+    
+    def _worker_loop(self):
+        """Run queued background jobs in order on the worker thread"""
+        while True:
+            job, args = self._jobs.get()
+            try:
+                job(*args)
+            except Exception as e:
+                self.logger.error(f"Background job {getattr(job, '__name__', job)} failed: {e}")
+            finally:
+                self._jobs.task_done()
+    
+    def run_in_background(self, job, *args):
+        """Queue a job for the persistent worker thread"""
+        self._jobs.put((job, args))
+    
     def schedule_cleanup(self):
         """Schedule periodic cleanup of temporary files"""
         def cleanup_task():
             try:
-                self.cleanup_temp_files()
+                # Scan and delete on the I/O pool so large temp dirs don't stall the UI
+                self._io_pool.submit(self.cleanup_temp_files)
             except Exception as e:
                 self.logger.warning(f"Cleanup task failed: {e}")
             
@@ -151,7 +270,7 @@ class ApplicationGUI:
     
     def cleanup_temp_files(self):
         """Clean up old temporary result files"""
-        temp_dir = "data/temp/results"
+        temp_dir = AppConfig.TEMP_RESULTS_DIR
         if not os.path.exists(temp_dir):
             return
         
@@ -159,12 +278,36 @@ class ApplicationGUI:
         cleaned_count = 0
         
         try:
-            for file in os.listdir(temp_dir):
-                if file.endswith('.json'):
-                    file_path = os.path.join(temp_dir, file)
-                    if os.path.getctime(file_path) < cutoff_time:
-                        os.remove(file_path)
-                        cleaned_count += 1
+            # Downloads are tracked in the database; only stale entries are touched.
+            # Entries are dropped only once their file is gone, so failures are retried next time
+            removed = []
+            for file_path in self.database.get_stale_temp_files(cutoff_time):
+                try:
+                    os.remove(file_path)
+                    cleaned_count += 1
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self.logger.warning(f"Could not remove temporary file {file_path}: {e}")
+                    continue
+                removed.append(file_path)
+            self.database.forget_temp_files(removed)
+            
+            if not self._temp_dir_scanned:
+                # Files left by older versions were never tracked; sweep the directory until it succeeds once
+                swept = True
+                with os.scandir(temp_dir) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.name.endswith('.json') and entry.stat(follow_symlinks=False).st_ctime < cutoff_time:
+                                os.remove(entry.path)
+                                cleaned_count += 1
+                        except FileNotFoundError:
+                            pass
+                        except OSError as e:
+                            self.logger.warning(f"Could not remove temporary file {entry.path}: {e}")
+                            swept = False
+                self._temp_dir_scanned = swept
             
             if cleaned_count > 0:
                 self.log_message(f"Cleaned up {cleaned_count} old temporary files")
@@ -351,11 +494,11 @@ class ApplicationGUI:
         self.detail_table.column("details", width=300, minwidth=200)
         
         # Scrollbar
-        detail_table_scrollbar = ttk.Scrollbar(detail_table_frame, orient=tk.VERTICAL, command=self.detail_table.yview)
-        self.detail_table.configure(yscrollcommand=detail_table_scrollbar.set)
+        self.detail_table_scrollbar = ttk.Scrollbar(detail_table_frame, orient=tk.VERTICAL, command=self.detail_table.yview)
+        self.detail_table.configure(yscrollcommand=self._on_detail_table_scroll)
         
         self.detail_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        detail_table_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.detail_table_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Action buttons frame at the bottom
         action_frame = ttk.Frame(self.main_tab)
@@ -367,10 +510,9 @@ class ApplicationGUI:
         self.cancel_button = ttk.Button(action_frame, text="Cancel", command=self.cancel_processing, state=tk.DISABLED)
         self.cancel_button.pack(side=tk.LEFT, padx=5)
         
-        self.progress_var = tk.IntVar()
-        self.progress_bar = ttk.Progressbar(action_frame, orient=tk.HORIZONTAL, length=300, mode='determinate', variable=self.progress_var)
+        self.progress_bar = ttk.Progressbar(action_frame, orient=tk.HORIZONTAL, length=300, mode='determinate', value=0)
         self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10)
-        self.progress_var.set(0)
+        self._last_progress = 0
     
     def setup_history_tab(self):
         """Setup the history tab content"""
@@ -462,20 +604,48 @@ class ApplicationGUI:
         self.status_canvas = tk.Canvas(status_frame, width=15, height=15)
         self.status_canvas.pack(side=tk.LEFT, padx=5, pady=2)
         self.status_circle = self.status_canvas.create_oval(2, 2, 13, 13, fill="red")
+        self._status_circle_color = "red"
         
         # Status text
         ttk.Label(status_frame, textvariable=self.connection_status).pack(side=tk.LEFT, padx=5)
         
         # Current time
         self.time_var = tk.StringVar()
-        self.update_clock()
+        self._last_time_str = ""
+        self._clock_day = -1
+        self._clock_date_prefix = ""
+        self._clock_after_id = self.root.after_idle(self.update_clock)
+        self.root.bind("<Map>", self._on_root_mapped, add="+")
         ttk.Label(status_frame, textvariable=self.time_var).pack(side=tk.RIGHT, padx=10)
     
     def update_clock(self):
         """Update the clock in the status bar"""
-        current_time = time.strftime("%Y-%m-%d %H:%M:%S")
-        self.time_var.set(current_time)
-        self.root.after(1000, self.update_clock)
+        if self.root.state() == "iconic":
+            # Nothing is visible while minimized; check back slowly until restored
+            self._clock_after_id = self.root.after(AppConfig.CLOCK_ICONIFIED_INTERVAL_MS, self.update_clock)
+            return
+        
+        now = time.time()
+        local = time.localtime(now)
+        if local.tm_yday != self._clock_day:
+            # Only reformat the date part when the day rolls over
+            self._clock_day = local.tm_yday
+            self._clock_date_prefix = time.strftime("%Y-%m-%d ", local)
+        
+        current_time = f"{self._clock_date_prefix}{local.tm_hour:02d}:{local.tm_min:02d}:{local.tm_sec:02d}"
+        if current_time != self._last_time_str:
+            self._last_time_str = current_time
+            self.time_var.set(current_time)
+        
+        # Fire just after the next second rollover instead of drifting
+        delay_ms = 1000 - int((now % 1) * 1000)
+        self._clock_after_id = self.root.after(delay_ms, self.update_clock)
+    
+    def _on_root_mapped(self, event):
+        """Refresh the clock immediately when the main window is restored"""
+        if event.widget is self.root:
+            self.root.after_cancel(self._clock_after_id)
+            self.update_clock()
     
     # ============================================================================
     # ENHANCED CONNECTION METHODS
@@ -486,20 +656,32 @@ class ApplicationGUI:
         if not self.validate_connection_fields():
             return
         
-        self.connection_status.set("Connecting...")
+        if self._connection_recently_verified():
+            # No round-trip was made; say so rather than reporting a fresh success
+            age = self._connection_verified_age()
+            self._apply_connection_state("Connected (cached)", "green",
+                                         f"Connection verified {age:.0f}s ago - skipping re-test (cached result)",
+                                         (messagebox.showinfo, "Connection",
+                                          f"Connection verified {age:.0f}s ago (cached result).\n"
+                                          "Remote paths were verified then; no new test was run."))
+            return
+        
+        self._set_connection_status("Connecting...")
         self.update_status_circle("yellow")
         self.log_message("Testing connection to " + self.lan_ip_var.get() + "...")
         
-        threading.Thread(target=self._test_connection_thread, daemon=True).start()
+        self.run_in_background(self._test_connection_thread)
 
     def _test_connection_thread(self):
         """Connection test thread with enhanced error handling"""
         max_attempts = AppConfig.MAX_RECONNECT_ATTEMPTS
         attempt_delay = AppConfig.CONNECTION_RETRY_DELAY
+        deadline = time.monotonic() + AppConfig.CONNECTION_TEST_DEADLINE
+        self._cancel_event.clear()  # May still be set by a cancelled run that preceded this job
         
         for attempt in range(1, max_attempts + 1):
             try:
-                self.root.after(0, lambda a=attempt: self.log_message(f"Connection attempt {a}/{max_attempts}..."))
+                self.root.after(0, self.log_message, f"Connection attempt {attempt}/{max_attempts}...")
                 
                 success = self.ssh_connection.connect(
                     hostname=self.lan_ip_var.get(),
@@ -516,21 +698,25 @@ class ApplicationGUI:
                         self._handle_connection_failure("Remote paths not accessible")
                     return
                 else:
-                    if attempt < max_attempts:
-                        self.root.after(0, lambda: self.log_message(f"Attempt {attempt} failed, retrying in {attempt_delay}s..."))
-                        time.sleep(attempt_delay)
-                        attempt_delay *= 2  # Exponential backoff
+                    if attempt < max_attempts and time.monotonic() + attempt_delay < deadline:
+                        self.root.after(0, self.log_message, f"Attempt {attempt} failed, retrying in {attempt_delay}s...")
+                        if self._wait_or_cancel(attempt_delay):
+                            return
+                        attempt_delay = min(attempt_delay * 2, AppConfig.MAX_RETRY_DELAY)  # Exponential backoff
                     else:
                         self._handle_connection_failure("Authentication failed after all attempts")
+                        return
                         
             except Exception as e:
                 error_msg = f"Connection error on attempt {attempt}: {str(e)}"
-                if attempt < max_attempts:
-                    self.root.after(0, lambda msg=error_msg: self.log_message(f"{msg}, retrying..."))
-                    time.sleep(attempt_delay)
-                    attempt_delay *= 2
+                if attempt < max_attempts and time.monotonic() + attempt_delay < deadline:
+                    self.root.after(0, self.log_message, f"{error_msg}, retrying...")
+                    if self._wait_or_cancel(attempt_delay):
+                        return
+                    attempt_delay = min(attempt_delay * 2, AppConfig.MAX_RETRY_DELAY)
                 else:
                     self._handle_connection_failure(error_msg)
+                    return
 
     def _verify_remote_paths(self) -> bool:
         """Verify remote paths are accessible"""
@@ -539,44 +725,75 @@ class ApplicationGUI:
             (self.result_path_var.get(), "Result path")
         ]
         
+        # Check every path in one round-trip; the command prints the paths that fail
+        checks = " ".join(shlex.quote(path) for path, _ in paths)
+        success, stdout, stderr = self.ssh_connection.execute_command(
+            f'for p in {checks}; do test -d "$p" && test -w "$p" || echo "$p"; done'
+        )
+        failed = set(stdout.splitlines()) if success else {path for path, _ in paths}
+        
         for path, description in paths:
-            success, stdout, stderr = self.ssh_connection.execute_command(f"test -d '{path}' && test -w '{path}'")
-            if not success:
-                self.root.after(0, lambda p=path, d=description: self.log_message(f"{d} not accessible: {p}"))
+            if path in failed:
+                self.root.after(0, self.log_message, f"{description} not accessible: {path}")
                 return False
             
-        self.root.after(0, lambda: self.log_message("All remote paths verified"))
+        self.root.after(0, self.log_message, "All remote paths verified")
         return True
 
+    def _connection_recently_verified(self) -> bool:
+        """Check if a full connection test succeeded within the cache TTL"""
+        return self.ssh_connection.connected and time.monotonic() < self._connection_verified_until
+    
+    def _connection_verified_age(self) -> float:
+        """Seconds since the connection test that the cache is based on"""
+        return time.monotonic() - (self._connection_verified_until - AppConfig.CONNECTION_CACHE_TTL)
+    
+    def _invalidate_connection_cache(self, *args):
+        """Forget the last successful connection test"""
+        self._connection_verified_until = 0.0
+    
     def _handle_connection_success(self):
         """Handle successful connection"""
-        self.database.log_connection(
+        self._connection_verified_until = time.monotonic() + AppConfig.CONNECTION_CACHE_TTL
+        # The connection log is written on the I/O pool so the SSH worker isn't held up
+        self._io_pool.submit(
+            self.database.log_connection,
             self.lan_ip_var.get(), 
             "Connected", 
             "Connection test successful with path verification"
         )
         
-        self.root.after(0, lambda: self.connection_status.set("Connected"))
-        self.root.after(0, lambda: self.update_status_circle("green"))
-        self.root.after(0, lambda: self.log_message("Connection successful - All systems ready"))
-        self.root.after(0, lambda: messagebox.showinfo("Connection", "Connection successful!\nRemote paths verified."))
+        self.root.after(0, self._apply_connection_state, "Connected", "green",
+                        "Connection successful - All systems ready",
+                        (messagebox.showinfo, "Connection", "Connection successful!\nRemote paths verified."))
 
     def _handle_connection_failure(self, error_msg: str):
         """Handle connection failure"""
-        self.database.log_connection(
+        self._io_pool.submit(
+            self.database.log_connection,
             self.lan_ip_var.get(), 
             "Failed", 
             error_msg
         )
         
-        self.root.after(0, lambda: self.connection_status.set("Connection failed"))
-        self.root.after(0, lambda: self.update_status_circle("red"))
-        self.root.after(0, lambda: self.log_message(f"Connection failed: {error_msg}"))
-        self.root.after(0, lambda: messagebox.showerror("Connection Failed", f"Unable to connect:\n{error_msg}\n\nPlease check:\n• IP address and network connectivity\n• Username and password\n• Remote directory permissions"))
+        self.root.after(0, self._apply_connection_state, "Connection failed", "red",
+                        f"Connection failed: {error_msg}",
+                        (messagebox.showerror, "Connection Failed", f"Unable to connect:\n{error_msg}\n\nPlease check:\n• IP address and network connectivity\n• Username and password\n• Remote directory permissions"))
+    
+    def _apply_connection_state(self, state: str, color: str, message: str = "", dialog: Optional[Tuple] = None):
+        """Apply a connection state change to the UI in a single Tk callback"""
+        self._set_connection_status(state)
+        self.update_status_circle(color)
+        if message:
+            self.log_message(message)
+        if dialog:
+            show_dialog, title, text = dialog
+            show_dialog(title, text)
 
     def _attempt_reconnection(self) -> bool:
         """Attempt to reconnect SSH"""
         self.log_message("Attempting to reconnect...")
+        retry_delay = AppConfig.CONNECTION_RETRY_DELAY
         
         for attempt in range(AppConfig.MAX_RECONNECT_ATTEMPTS):
             try:
@@ -589,232 +806,266 @@ class ApplicationGUI:
                 
                 if success:
                     self.log_message("Reconnection successful")
-                    self.root.after(0, lambda: self.update_status_circle("green"))
+                    self.root.after(0, self.update_status_circle, "green")
                     return True
-                else:
-                    time.sleep(2)
                     
             except Exception as e:
                 self.log_message(f"Reconnection attempt {attempt + 1} failed: {str(e)}")
-                time.sleep(2)
+            
+            if self._wait_or_cancel(retry_delay):
+                break
+            retry_delay = min(retry_delay * 2, AppConfig.MAX_RETRY_DELAY)
         
         self.log_message("All reconnection attempts failed")
-        self.root.after(0, lambda: self.update_status_circle("red"))
+        self.root.after(0, self.update_status_circle, "red")
         return False
     
+    def _wait_or_cancel(self, delay: float) -> bool:
+        """Sleep for a jittered delay; returns True early if processing was cancelled"""
+        return self._cancel_event.wait(delay * random.uniform(1.0, 1.5))
+    
     # ============================================================================
     # ENHANCED FILE PROCESSING METHODS
     # ============================================================================
     
-    def wait_for_result_file(self, base_filename: str, result_dir: str, upload_time: float, timeout: int = 180) -> Tuple[str, str]:
+    def wait_for_result_file(self, base_filename: str, result_dir: str, upload_time: float, timeout: int = 180,
+                             known_files: Optional[Set[str]] = None) -> Tuple[str, str, Set[str]]:
         """
         Wait for any new result file to appear after test file upload
-        Returns: (file_path, filename) or raises Exception
+        known_files is the directory content before the upload, e.g. as returned by the previous wait;
+        without it the directory is listed first
+        Returns: (file_path, filename, known_files including the result) or raises Exception
         Enhanced to handle network interruptions and service restarts
         """
         start_wait = time.time()
-        check_interval = 3  # More frequent checking
+        check_interval = AppConfig.RESULT_CHECK_INTERVAL
         last_log_time = 0
-        known_files = set()
         
         # Track whether this is a network-affecting test
-        is_network_test = "wan" in base_filename.lower() or "network" in base_filename.lower()
+        # Result names are matched case-insensitively against the test name, computed once per wait
+        base_lower = base_filename.lower()
+        result_log_re = re.compile(self.RESULT_LOG_TEMPLATE.format(name=re.escape(base_filename)))
+        upload_ts = int(self.ssh_connection.to_remote_time(upload_time))  # Router mtimes use the router's clock
+        is_network_test = self._is_network_name(base_lower)
         reconnect_attempts = 0
         max_reconnect_attempts = 10 if is_network_test else 3
         reconnect_delay = 5
         
         self.log_message(f"Waiting for result file in {result_dir}")
         
-        # Get initial file list
-        success, stdout, stderr = self.ssh_connection.execute_command(f"ls -1 {result_dir}/ 2>/dev/null")
-        if success:
-            known_files = set(f for f in stdout.strip().split('\n') if f and len(f) > 3)
-            self.log_message(f"Initial file count: {len(known_files)}")
+        # Watch the directory so new files are seen within one round-trip; directory scans
+        # still run once up front and then only as a fallback
+        watch = self.ssh_connection.open_watch(result_dir)
+        next_scan = 0.0
+        
+        if known_files is not None:
+            known_files = set(known_files)
+        else:
+            # Get initial file list; the first scan below reuses it
+            known_files = set()
+            attrs = self._list_result_dir(result_dir)
+            if attrs is not None:
+                known_files = set(a.filename for a in attrs if len(a.filename) > 3)
+        self.log_message(f"Initial file count: {len(known_files)}")
+        
+        # New result files that were not ready yet; they stay out of known_files so the
+        # next watch event or scan checks them again
+        pending_files: Set[str] = set()
         
-        while time.time() - start_wait < timeout and self.processing:
-            elapsed = time.time() - start_wait
-            
-            # Check SSH connection
-            if not self.ssh_connection.is_connected():
-                self.log_message(f"Connection lost. Attempting to reconnect ({reconnect_attempts+1}/{max_reconnect_attempts})...")
+        try:
+            while time.time() - start_wait < timeout and self.processing:
+                elapsed = time.time() - start_wait
                 
-                if reconnect_attempts < max_reconnect_attempts:
-                    # Wait before reconnection (longer for network tests)
-                    time.sleep(reconnect_delay if reconnect_attempts == 0 else reconnect_delay * 2)
-                    
-                    # Try to reconnect
-                    success = self.ssh_connection.connect(
-                        hostname=self.lan_ip_var.get(),
-                        username=self.username_var.get(),
-                        password=self.password_var.get()
-                    )
+                # Check SSH connection
+                if not self.ssh_connection.is_connected():
+                    self.log_message(f"Connection lost. Attempting to reconnect ({reconnect_attempts+1}/{max_reconnect_attempts})...")
                     
-                    if success:
-                        self.log_message("Successfully reconnected after network interruption")
-                        reconnect_attempts = 0
+                    if reconnect_attempts < max_reconnect_attempts:
+                        # Wait before reconnection (longer for network tests)
+                        if self._wait_or_cancel(reconnect_delay if reconnect_attempts == 0 else reconnect_delay * 2):
+                            break
+                        
+                        # Try to reconnect
+                        success = self.ssh_connection.connect(
+                            hostname=self.lan_ip_var.get(),
+                            username=self.username_var.get(),
+                            password=self.password_var.get()
+                        )
+                        
+                        if success:
+                            self.log_message("Successfully reconnected after network interruption")
+                            reconnect_attempts = 0
+                            self._close_watch(watch)
+                            watch = self.ssh_connection.open_watch(result_dir)
+                            next_scan = 0.0
+                        else:
+                            reconnect_attempts += 1
+                            continue
                     else:
-                        reconnect_attempts += 1
-                        continue
-                else:
-                    self.log_message("Maximum reconnection attempts reached")
-                    # Instead of failing, use a more aggressive approach to find results
-            
-            # Multiple detection strategies
-            # 1. Direct pattern search
-            pattern_cmd = f"find {result_dir} -type f -name '{base_filename}*' -o -name '*{base_filename}*' -newermt '@{int(upload_time)}' 2>/dev/null"
-            success, pattern_stdout, _ = self.ssh_connection.execute_command(pattern_cmd)
-            
-            if success and pattern_stdout.strip():
-                files = pattern_stdout.strip().split("\n")
-                file_path = files[0].strip()
-                file_name = os.path.basename(file_path)
+                        self.log_message("Maximum reconnection attempts reached")
+                        # Instead of failing, use a more aggressive approach to find results
                 
-                self.log_message(f"Found matching file via pattern search: {file_name}")
-                if self._verify_file_ready(file_path):
-                    return file_path, file_name
-            
-            # 2. Latest file check
-            latest_cmd = f"ls -lt {result_dir}/ | grep -v '^total' | head -1"
-            success, latest_stdout, _ = self.ssh_connection.execute_command(latest_cmd)
-            
-            if success and latest_stdout.strip():
-                parts = latest_stdout.strip().split()
-                if len(parts) >= 9:  # ls -lt format includes permissions, owner, etc.
-                    file_name = parts[8]
-                    file_path = f"{result_dir}/{file_name}"
+                if watch is not None and watch.exit_status_ready():
+                    # The watch ended (session dropped or the shell failed); fall back to polling
+                    self._close_watch(watch)
+                    watch = None
+                
+                if watch is None or elapsed >= next_scan:
+                    # One listing (SFTP or a single stat command) carries name, size and mtime
+                    attrs = self._list_result_dir(result_dir)
+                    if attrs is not None:
+                        current_files = {a.filename: a for a in attrs if len(a.filename) > 3}
+                        new_files = current_files.keys() - known_files
+                        
+                        # Files named after the test and written since the upload come first, then other new files
+                        candidates = [name for name, a in current_files.items()
+                                      if base_filename in name and (a.st_mtime or 0) >= upload_ts]
+                        candidates += sorted(new_files, key=lambda name: base_lower not in name.lower())
+                        
+                        target_file = self._pick_ready_file(result_dir, list(dict.fromkeys(candidates)), current_files)
+                        if target_file:
+                            self.log_message(f"[{elapsed:.0f}s] Found new result file: {target_file}")
+                            return f"{result_dir}/{target_file}", target_file, set(current_files)
+                        
+                        pending_files = {name for name in new_files if name.endswith(".json")}
+                        known_files = set(current_files) - pending_files
                     
-                    # Check if this is a new file
-                    if file_name not in known_files:
-                        self.log_message(f"Found new file via latest check: {file_name}")
-                        if self._verify_file_ready(file_path):
-                            return file_path, file_name
-            
-            # 3. Full directory comparison
-            success, curr_stdout, _ = self.ssh_connection.execute_command(f"ls -1 {result_dir}/ 2>/dev/null")
-            if success and curr_stdout.strip():
-                current_files = set(f for f in curr_stdout.strip().split('\n') if f and len(f) > 3)
-                new_files = current_files - known_files
+                    next_scan = elapsed + AppConfig.RESULT_RESCAN_INTERVAL
+                
+                # Log progress periodically
+                if elapsed - last_log_time >= 15:
+                    self.log_message(f"[{elapsed:.0f}s] Still waiting for result file...")
+                    last_log_time = elapsed
                 
+                if watch is None:
+                    time.sleep(check_interval)
+                    continue
+                
+                # Block until the watch reports new files or the check interval passes
+                new_files = [f for f in self.ssh_connection.read_watch_events(watch, check_interval) if f not in known_files]
                 if new_files:
-                    self.log_message(f"Found {len(new_files)} new files: {', '.join(new_files)}")
-                    
-                    # Find the most relevant file
-                    target_file = None
-                    
-                    # First priority: Files containing the base filename
-                    relevant_files = [f for f in new_files if base_filename.lower() in f.lower()]
-                    if relevant_files:
-                        target_file = relevant_files[0]
-                    elif new_files:  # Second priority: Any new file
-                        target_file = list(new_files)[0]
-                    
-                    if target_file:
+                    # Anything that is not a .json file is never a result; every other
+                    # file is (re)checked until it is ready
+                    known_files.update(f for f in new_files if not f.endswith(".json"))
+                    pending_files.update(f for f in new_files if f.endswith(".json"))
+                    relevant_files = [f for f in pending_files if base_lower in f.lower()]
+                    for target_file in relevant_files or sorted(pending_files):
                         file_path = f"{result_dir}/{target_file}"
                         if self._verify_file_ready(file_path):
-                            self.log_message(f"[{elapsed:.0f}s] Found new result file: {target_file}")
-                            return file_path, target_file
-                
-                # Update known files list anyway
-                known_files = current_files
-            
-            # Log progress periodically
-            if elapsed - last_log_time >= 15:
-                self.log_message(f"[{elapsed:.0f}s] Still waiting for result file...")
-                last_log_time = elapsed
-            
-            time.sleep(check_interval)
+                            self.log_message(f"[{time.time() - start_wait:.0f}s] Found new result file via directory watch: {target_file}")
+                            return file_path, target_file, known_files | pending_files
+        finally:
+            self._close_watch(watch)
+            self._listing_cache.pop(result_dir, None)
         
         # Last resort - check application.log directly to find the result filename
         self.log_message("Timeout approaching, checking application.log for result filename...")
-        log_cmd = f"grep -a 'Successfully wrote .* bytes to file result/' /var/log/application.log | grep -a '{base_filename}' | tail -1"
-        success, log_stdout, _ = self.ssh_connection.execute_command(log_cmd)
-        
-        if success and log_stdout.strip():
-            # Extract filename from log line like:
-            # DEBUG: Successfully wrote 127 bytes to file result/wan_create_20250529_133820.json
-            import re
-            match = re.search(r'result/([^/\s]+\.json)', log_stdout)
-            if match:
-                result_filename = match.group(1)
-                file_path = f"{result_dir}/{result_filename}"
-                self.log_message(f"Found result filename from logs: {result_filename}")
-                
-                # Check if file exists
-                if self.ssh_connection.file_exists(file_path) and self._verify_file_ready(file_path):
-                    return file_path, result_filename
+        log_tail = self._read_app_log_tail()
+        
+        # Log lines look like:
+        # DEBUG: Successfully wrote 127 bytes to file result/wan_create_20250529_133820.json
+        written = result_log_re.findall(log_tail)
+        if written:
+            result_filename = written[-1]  # Most recent write
+            file_path = f"{result_dir}/{result_filename}"
+            self.log_message(f"Found result filename from logs: {result_filename}")
+            
+            # Check if file exists
+            if self.ssh_connection.file_exists(file_path) and self._verify_file_ready(file_path):
+                return file_path, result_filename, known_files | pending_files | {result_filename}
         
         raise Exception(f"Timeout waiting for result file after {timeout} seconds")
     
-    def _find_by_timestamp_strategy(self, base_filename: str, result_dir: str, upload_time: float) -> Optional[Tuple[str, str]]:
-        """Find files created after upload time"""
-        cmd = f"find {result_dir} -name '{base_filename}_*.json' -newermt '@{int(upload_time)}' 2>/dev/null"
-        success, stdout, stderr = self.ssh_connection.execute_command(cmd)
-        
-        if success and stdout.strip():
-            files = [f.strip() for f in stdout.strip().split('\n') if f.strip()]
-            if files:
-                # Take the latest file
-                files.sort()
-                file_path = files[-1]
-                if self._verify_file_ready(file_path):
-                    return file_path, os.path.basename(file_path)
-        return None
-
-    def _find_by_pattern_strategy(self, base_filename: str, result_dir: str, upload_time: float) -> Optional[Tuple[str, str]]:
-        """Find files by pattern and check modification time"""
-        cmd = f"ls {result_dir}/{base_filename}_*.json 2>/dev/null"
-        success, stdout, stderr = self.ssh_connection.execute_command(cmd)
-        
-        if success and stdout.strip():
-            files = [f.strip() for f in stdout.strip().split('\n') if f.strip()]
-            recent_files = []
-            
-            for file_path in files:
-                # Check modification time
-                stat_cmd = f"stat -c%Y '{file_path}' 2>/dev/null"
-                stat_success, stat_out, _ = self.ssh_connection.execute_command(stat_cmd)
-                
-                if stat_success and stat_out.strip().isdigit():
-                    mod_time = int(stat_out.strip())
-                    if mod_time >= upload_time - 5:  # 5 second buffer
-                        recent_files.append((mod_time, file_path))
+    def _read_app_log_tail(self) -> str:
+        """
+        Return the end of the router's application.log. The first call in a batch fetches the
+        last APP_LOG_TAIL_BYTES; later calls fetch only what was appended since
+        """
+        offset = self._app_log_offset if self._app_log_offset is not None else -1
+        # Prints "<start> <size>" then the bytes in between; a shrunken log (rotated) restarts from its tail
+        success, stdout, _ = self.ssh_connection.execute_command(
+            f"f=/var/log/application.log; s=$(wc -c < \"$f\") || exit 1; o={offset}; "
+            f"if [ \"$o\" -lt 0 ] || [ \"$o\" -gt \"$s\" ] || [ $((s - o)) -gt {AppConfig.APP_LOG_TAIL_BYTES} ]; then "
+            f"o=$((s - {AppConfig.APP_LOG_TAIL_BYTES})); [ \"$o\" -lt 0 ] && o=0; fi; "
+            f"echo \"$o $s\"; tail -c +$((o + 1)) \"$f\" | head -c $((s - o))"
+        )
+        header, _, data = stdout.partition("\n")
+        parts = header.split()
+        if not success or len(parts) != 2 or not all(p.isdigit() for p in parts):
+            return self._app_log_tail
+        
+        start, size = int(parts[0]), int(parts[1])
+        if start != self._app_log_offset:
+            self._app_log_tail = ""  # Not contiguous with what we have
+        self._app_log_tail = (self._app_log_tail + data)[-AppConfig.APP_LOG_TAIL_BYTES:]
+        self._app_log_offset = size
+        return self._app_log_tail
+    
+    def _list_result_dir(self, result_dir: str) -> Optional[List]:
+        """List a result directory, reusing a listing younger than half the check interval"""
+        now = time.monotonic()
+        cached = self._listing_cache.get(result_dir)
+        if cached and now - cached[0] < AppConfig.RESULT_CHECK_INTERVAL / 2:
+            return cached[1]
+        
+        attrs = self.ssh_connection.list_directory(result_dir)
+        if attrs is not None:
+            self._listing_cache[result_dir] = (now, attrs)
+        return attrs
+    
+    def _pick_ready_file(self, result_dir: str, candidates: List[str], listing: Dict, min_size: int = 10) -> Optional[str]:
+        """
+        Return the first candidate that is ready, checking all of them together:
+        sizes come from the listing, and a single re-listing after a short wait confirms stability
+        """
+        sized = [name for name in candidates if (listing[name].st_size or 0) >= min_size]
+        if not sized:
+            return None
+        
+        later_sizes = None
+        for name in sized:
+            # Network tests only need the file to exist with content, as in _verify_file_ready
+            if self._is_network_name(name.lower()):
+                return name
             
-            if recent_files:
-                # Sort by modification time (newest first)
-                recent_files.sort(reverse=True)
-                file_path = recent_files[0][1]
-                if self._verify_file_ready(file_path):
-                    return file_path, os.path.basename(file_path)
-        return None
-
-    def _find_latest_strategy(self, base_filename: str, result_dir: str, upload_time: float) -> Optional[Tuple[str, str]]:
-        """Find latest matching file regardless of timestamp"""
-        cmd = f"ls -t {result_dir}/{base_filename}_*.json 2>/dev/null | head -1"
-        success, stdout, stderr = self.ssh_connection.execute_command(cmd)
-        
-        if success and stdout.strip():
-            file_path = stdout.strip()
-            if self._verify_file_ready(file_path):
-                return file_path, os.path.basename(file_path)
+            if later_sizes is None:
+                time.sleep(0.5)
+                later_sizes = {a.filename: a.st_size for a in self.ssh_connection.list_directory(result_dir) or []}
+            if later_sizes.get(name) == listing[name].st_size:
+                return name
         return None
-
+    
+    def _close_watch(self, watch):
+        """Stop a directory watch started by wait_for_result_file"""
+        if watch is not None:
+            try:
+                watch.close()
+            except Exception:
+                pass
+    
+    @staticmethod
+    def _is_network_name(name_lower: str) -> bool:
+        """Whether a lowercased test or result name belongs to a network (WAN) test"""
+        return "wan" in name_lower or "network" in name_lower
+    
     def _verify_file_ready(self, file_path: str, min_size: int = 10) -> bool:
         """Verify file is ready and stable with more lenient checks"""
         try:
-            # Check file exists
-            exists_cmd = f"test -f '{file_path}' && echo 'exists'"
-            success, stdout, _ = self.ssh_connection.execute_command(exists_cmd)
-            
-            if not (success and "exists" in stdout):
-                return False
-            
-            # Check file size
-            size1 = self.ssh_connection.get_file_size(file_path)
+            # Check file size and mtime in one stat (None when the file doesn't exist)
+            attrs = self.ssh_connection.stat_file(file_path)
+            size1 = (attrs.st_size or 0) if attrs is not None else 0
             if size1 < min_size:  # Even very small files should be at least 10 bytes
                 return False
             
             # For network tests, be more lenient - just check existence
-            if "wan" in os.path.basename(file_path).lower() or "network" in os.path.basename(file_path).lower():
+            if self._is_network_name(os.path.basename(file_path).lower()):
+                return True
+            
+            # Small files that haven't changed for a while are final; skip the second stat
+            remote_now = self.ssh_connection.remote_time()
+            if (remote_now is not None and attrs.st_mtime is not None
+                    and size1 <= AppConfig.SETTLED_FILE_MAX_SIZE
+                    and remote_now - attrs.st_mtime > AppConfig.SETTLED_FILE_AGE):
                 return True
             
             # Regular case - check file stability
@@ -839,39 +1090,75 @@ class ApplicationGUI:
         # Clear existing selection
         self.clear_files()
         
+        # Validate files on the I/O pool; results are applied on the UI thread once all are parsed
+        self._file_load_generation += 1
+        generation = self._file_load_generation
+        self._pending_file_loads = len(files)
+        futures = [self._io_pool.submit(self._load_test_file, file_path) for file_path in files]
+        
+        def on_done(_future):
+            self.root.after(0, self._on_test_file_loaded, generation, files, futures)
+        
+        for future in futures:
+            future.add_done_callback(on_done)
+        
+        self.log_message(f"Validating {len(files)} files...")
+    
+    def _load_test_file(self, file_path: str) -> Tuple:
+        """Stat, parse and analyze a test file (runs on the I/O pool)"""
+        file_stat = os.stat(file_path)
+        file_size = file_stat.st_size
+        is_valid, error_msg, data = self.file_manager.validate_json_file(file_path, file_stat)
+        impacts = self.file_manager.analyze_test_impacts(data) if is_valid else None
+        return file_size, is_valid, error_msg, data, impacts
+    
+    def _on_test_file_loaded(self, generation: int, files: Tuple, futures: List):
+        """Count finished file loads and apply the results once the whole batch is done"""
+        if generation != self._file_load_generation:
+            return  # Selection was cleared or replaced meanwhile
+        
+        self._pending_file_loads -= 1
+        if self._pending_file_loads > 0:
+            return
+        
         # Validate and add files
         valid_files = []
         invalid_files = []
+        table_rows = []
         
-        for file_path in files:
+        for file_path, future in zip(files, futures):
+            file_name = os.path.basename(file_path)
             try:
-                is_valid, error_msg, data = self.file_manager.validate_json_file(file_path)
+                file_size, is_valid, error_msg, data, impacts = future.result()
                 
                 if is_valid:
                     valid_files.append(file_path)
                     
                     # Store file data
-                    file_name = os.path.basename(file_path)
+                    test_count = self.file_manager.get_test_case_count(data)
                     self.file_data[file_name] = {
                         "path": file_path,
+                        "size": file_size,
                         "data": data,
-                        "impacts": self.file_manager.analyze_test_impacts(data)
+                        "impacts": impacts,
+                        "test_count": test_count
                     }
                     
                     # Add to table
-                    file_size = os.path.getsize(file_path)
-                    size_str = f"{file_size / 1024:.1f} KB" if file_size < 1024*1024 else f"{file_size / (1024*1024):.1f} MB"
-                    test_count = self.file_manager.get_test_case_count(data)
+                    size_str = format_file_size(file_size)
                     
-                    self.file_table.insert("", "end", values=(file_name, size_str, test_count, "Waiting", "", ""))
+                    table_rows.append((file_name, size_str, test_count, "Waiting", "", ""))
                     
                 else:
-                    invalid_files.append((os.path.basename(file_path), error_msg))
-                    self.log_message(f"Invalid file {os.path.basename(file_path)}: {error_msg}")
+                    invalid_files.append((file_name, error_msg))
+                    self.log_message(f"Invalid file {file_name}: {error_msg}")
                     
             except Exception as e:
-                invalid_files.append((os.path.basename(file_path), str(e)))
-                self.log_message(f"Error processing {os.path.basename(file_path)}: {str(e)}")
+                invalid_files.append((file_name, str(e)))
+                self.log_message(f"Error processing {file_name}: {str(e)}")
+        
+        # Add all valid files to the table in one pass
+        self._bulk_insert(self.file_table, table_rows)
         
         self.selected_files = valid_files
         self.log_message(f"Selected {len(valid_files)} valid files")
@@ -918,35 +1205,51 @@ class ApplicationGUI:
         # Reset retry counters
         self.file_retry_count = {}
         
+        # Snapshot table item IDs so status updates don't query Tk for them
+        self._file_items = self.file_table.get_children()
+        
         # Disable buttons and start processing
         self.send_button.configure(state=tk.DISABLED)
         self.cancel_button.configure(state=tk.NORMAL)
         self.processing = True
-        self.progress_var.set(0)
+        self._cancel_event.clear()
+        self._set_progress(0)
         
-        threading.Thread(target=self.process_files_real, daemon=True).start()
+        self.run_in_background(self.process_files_real)
     
     def process_files_real(self):
         """Process files using real modules with enhanced error handling"""
         start_time = time.time()
         total_files = len(self.selected_files)
         
+        # Settings are fixed for the run; read the Tk variables once instead of per file
+        target_ip = self.lan_ip_var.get()
+        target_username = self.username_var.get()
+        config_dir = self.config_path_var.get()
+        result_dir = self.result_path_var.get()
+        
         try:
             # 1. Establish connection
             self.log_message("Establishing SSH connection...")
             
             if not self.ssh_connection.is_connected():
                 success = self.ssh_connection.connect(
-                    hostname=self.lan_ip_var.get(),
-                    username=self.username_var.get(),
+                    hostname=target_ip,
+                    username=target_username,
                     password=self.password_var.get()
                 )
                 
                 if not success:
                     raise Exception("Failed to establish SSH connection")
             
-            self.root.after(0, lambda: self.connection_status.set("Connected"))
-            self.root.after(0, lambda: self.update_status_circle("green"))
+            self.root.after(0, self._apply_connection_state, "Connected", "green")
+            
+            # application.log is read at most once in full per batch, then only its new lines
+            self._app_log_tail = ""
+            self._app_log_offset = None
+            
+            # Result directory content after the previous file's result, the next wait's baseline
+            known_results = None
             
             # 2. Process each file
             for i, file_path in enumerate(self.selected_files):
@@ -954,19 +1257,21 @@ class ApplicationGUI:
                     break
                 
                 file_name = os.path.basename(file_path)
+                file_info = self.file_data[file_name]
                 file_start_time = time.time()
                 self.log_message(f"Processing file {i+1}/{total_files}: {file_name}")
                 
                 # Update progress
                 progress = int((i / total_files) * 100)
-                self.root.after(0, lambda p=progress: self.progress_var.set(p))
+                if progress != self._last_progress:
+                    self.root.after(0, self._set_progress, progress)
                 
                 # Update table status
                 self.update_file_status(i, "Sending", "", "")
                 
                 try:
                     # 3. Upload file
-                    remote_path = os.path.join(self.config_path_var.get(), file_name)
+                    remote_path = os.path.join(config_dir, file_name)
                     upload_success = self.ssh_connection.upload_file(file_path, remote_path)
                     
                     if not upload_success:
@@ -976,15 +1281,16 @@ class ApplicationGUI:
                     self.update_file_status(i, "Testing", "", "")
                     
                     # 4. Wait for result file with enhanced monitoring
-                    result_remote_path, actual_result_filename = self.wait_for_result_file(
+                    result_remote_path, actual_result_filename, known_results = self.wait_for_result_file(
                         base_filename=os.path.splitext(file_name)[0],
-                        result_dir=self.result_path_var.get(),
+                        result_dir=result_dir,
                         upload_time=time.time(),
-                        timeout=AppConfig.DEFAULT_TIMEOUT
+                        timeout=AppConfig.DEFAULT_TIMEOUT,
+                        known_files=known_results
                     )
                     
                     # 5. Download result
-                    local_result_dir = "data/temp/results"
+                    local_result_dir = AppConfig.TEMP_RESULTS_DIR
                     os.makedirs(local_result_dir, exist_ok=True)
                     local_result_path = os.path.join(local_result_dir, actual_result_filename)
                     
@@ -993,12 +1299,13 @@ class ApplicationGUI:
                     if not download_success:
                         raise Exception("Failed to download result file")
                     
+                    self.database.record_temp_file(local_result_path, time.time())
+                    
                     self.log_message(f"Result file {actual_result_filename} downloaded successfully")
                     
                     # 6. Parse result
                     try:
-                        with open(local_result_path, 'r') as f:
-                            result_data = json.load(f)
+                        result_data = load_json_file(local_result_path)
                     except Exception as e:
                         raise Exception(f"Failed to parse result file: {str(e)}")
                     
@@ -1010,34 +1317,36 @@ class ApplicationGUI:
                     self.update_file_status(i, "Completed", overall_result, f"{execution_time:.1f}s")
                     
                     # 7. Save to database
-                    file_info = self.file_data[file_name]
                     impacts = file_info["impacts"]
-                    test_count = self.file_manager.get_test_case_count(file_info["data"])
+                    test_count = file_info["test_count"]
+                    
+                    # Convert result format to match our expected format
+                    converted_results = self.convert_result_format(result_data)
                     
-                    file_id = self.database.save_test_file_result(
+                    # File row and test case rows are written in one transaction
+                    self.database.save_test_file_with_results(
                         file_name=file_name,
-                        file_size=os.path.getsize(file_path),
+                        file_size=file_info["size"],
                         test_count=test_count,
                         send_status="Completed",
                         overall_result=overall_result,
                         affects_wan=impacts["affects_wan"],
                         affects_lan=impacts["affects_lan"],
                         execution_time=execution_time,
-                        target_ip=self.lan_ip_var.get(),
-                        target_username=self.username_var.get()
+                        target_ip=target_ip,
+                        target_username=target_username,
+                        test_results=converted_results
                     )
                     
-                    # Convert result format to match our expected format
-                    converted_results = self.convert_result_format(result_data)
-                    if converted_results and file_id > 0:
-                        self.database.save_test_case_results(file_id, converted_results)
-                    
                     # Update detail table with results
                     self.update_detail_table_with_results(i, {"test_results": converted_results})
                     
                     self.log_message(f"File {file_name} processed successfully: {overall_result}")
                     
                 except Exception as e:
+                    # A late result of this file mustn't be taken for the next one's; list afresh
+                    known_results = None
+                    
                     # Enhanced error handling
                     error_type = type(e).__name__
                     error_msg = f"Error processing {file_name}: {str(e)}"
@@ -1049,7 +1358,7 @@ class ApplicationGUI:
                     if should_retry:
                         self.log_message(f"Retrying {file_name} in 5 seconds...")
                         self.update_file_status(i, "Retrying", "Error", "Retrying...")
-                        time.sleep(5)
+                        self._wait_or_cancel(5)
                         
                         # Try to reconnect if needed
                         if not self.ssh_connection.is_connected():
@@ -1062,28 +1371,44 @@ class ApplicationGUI:
                         self.update_file_status(i, "Error", "Failed", self._get_user_friendly_error(e))
                     
                     # Save error to database with detailed info
-                    self._save_error_to_database(file_name, file_path, e, file_start_time)
+                    self._save_error_to_database(file_name, file_info, e, file_start_time, target_ip, target_username)
             
             # All files processed
             if self.processing:
                 total_time = time.time() - start_time
                 self.log_message(f"All {total_files} files processed in {total_time:.1f} seconds")
-                self.root.after(0, lambda: messagebox.showinfo("Complete", f"All {total_files} files processed successfully"))
+                self.root.after(0, self._show_toast, f"All {total_files} files processed successfully")
             
         except Exception as e:
             error_msg = f"Processing error: {str(e)}"
             self.log_message(error_msg)
-            self.root.after(0, lambda: messagebox.showerror("Error", error_msg))
+            self.root.after(0, messagebox.showerror, "Error", error_msg)
         
         finally:
-            # Reset UI
+            # Reset UI and reload history in a single callback
+            completed = self.processing  # Still set unless cancelled
             self.processing = False
-            self.root.after(0, lambda: self.send_button.configure(state=tk.NORMAL))
-            self.root.after(0, lambda: self.cancel_button.configure(state=tk.DISABLED))
-            self.root.after(0, lambda: self.progress_var.set(100 if self.processing else 0))
-            
-            # Reload history
-            self.root.after(0, self.load_history)
+            self.root.after(0, self._reset_ui_after_processing, 100 if completed else 0)
+    
+    def _reset_ui_after_processing(self, progress: int):
+        """Restore buttons and progress after a processing run and refresh history"""
+        self.send_button.configure(state=tk.NORMAL)
+        self.cancel_button.configure(state=tk.DISABLED)
+        self._set_progress(progress)
+        self.load_history()
+    
+    def _show_toast(self, text: str, duration_ms: int = AppConfig.TOAST_DURATION_MS):
+        """Show a borderless notification near the bottom-right of the window that closes itself"""
+        toast = tk.Toplevel(self.root, bd=1, relief=tk.SOLID)
+        toast.overrideredirect(True)
+        ttk.Label(toast, text=text, padding=(12, 8)).pack()
+        
+        toast.update_idletasks()
+        x = self.root.winfo_rootx() + self.root.winfo_width() - toast.winfo_reqwidth() - 20
+        y = self.root.winfo_rooty() + self.root.winfo_height() - toast.winfo_reqheight() - 40
+        toast.geometry(f"+{x}+{y}")
+        
+        self.root.after(duration_ms, toast.destroy)
     
     # ============================================================================
     # ENHANCED ERROR HANDLING METHODS
@@ -1098,18 +1423,8 @@ class ApplicationGUI:
             return False
         
         # Check error type
-        retryable_errors = [
-            "timeout",
-            "connection lost",
-            "network",
-            "ssh",
-            "broken pipe",
-            "connection refused",
-            "no route to host"
-        ]
-        
         error_str = str(error).lower()
-        is_retryable = any(retry_error in error_str for retry_error in retryable_errors)
+        is_retryable = any(retry_error in error_str for retry_error in self.RETRYABLE_ERRORS)
         
         if is_retryable:
             self.file_retry_count[file_name] = retry_count + 1
@@ -1137,24 +1452,24 @@ class ApplicationGUI:
         
         return f"Unknown error ({type(error).__name__})"
 
-    def _save_error_to_database(self, file_name: str, file_path: str, error: Exception, start_time: float):
+    def _save_error_to_database(self, file_name: str, file_info: Dict, error: Exception, start_time: float,
+                                target_ip: str, target_username: str):
         """Save error details to database"""
         try:
-            file_info = self.file_data[file_name]
             impacts = file_info["impacts"]
-            test_count = self.file_manager.get_test_case_count(file_info["data"])
+            test_count = file_info["test_count"]
             
             self.database.save_test_file_result(
                 file_name=file_name,
-                file_size=os.path.getsize(file_path),
+                file_size=file_info["size"],
                 test_count=test_count,
                 send_status="Error",
                 overall_result="Failed",
                 affects_wan=impacts["affects_wan"],
                 affects_lan=impacts["affects_lan"],
                 execution_time=time.time() - start_time,
-                target_ip=self.lan_ip_var.get(),
-                target_username=self.username_var.get()
+                target_ip=target_ip,
+                target_username=target_username
             )
         except Exception as db_error:
             self.log_message(f"Failed to save error to database: {str(db_error)}")
@@ -1162,8 +1477,6 @@ class ApplicationGUI:
     def convert_result_format(self, openwrt_result):
         """Convert OpenWrt result format to our expected format"""
         try:
-            converted_results = []
-            
             # Convert summary info
             summary = openwrt_result.get("summary", {})
             total_tests = summary.get("total_test_cases", 0)
@@ -1172,29 +1485,28 @@ class ApplicationGUI:
             
             # Convert failed_by_service to individual test results
             failed_by_service = openwrt_result.get("failed_by_service", {})
+            get = dict.get
+            converted_results = [
+                {
+                    "service": get(test, "service", service),
+                    "action": get(test, "action", ""),
+                    "status": "pass" if get(test, "status", False) else "fail",
+                    "details": get(test, "message", ""),
+                    "execution_time": get(test, "execution_time_ms", 0) / 1000.0
+                }
+                for service, failed_tests in failed_by_service.items()
+                for test in failed_tests
+            ]
             
-            test_id = 0
-            for service, failed_tests in failed_by_service.items():
-                for test in failed_tests:
-                    converted_results.append({
-                        "service": test.get("service", service),
-                        "action": test.get("action", ""),
-                        "status": "pass" if test.get("status", False) else "fail",
-                        "details": test.get("message", ""),
-                        "execution_time": test.get("execution_time_ms", 0) / 1000.0
-                    })
-                    test_id += 1
-            
-            # Add passed tests (we need to infer these since they're not listed)
-            for i in range(passed):
-                if i == 0:  # Assume first test is ping which passed
-                    converted_results.insert(0, {
-                        "service": "ping",
-                        "action": "",
-                        "status": "pass",
-                        "details": "Ping test completed successfully",
-                        "execution_time": 8.0  # From the log
-                    })
+            # Passed tests aren't listed; assume the first one is ping, which passed
+            if passed > 0:
+                converted_results.insert(0, {
+                    "service": "ping",
+                    "action": "",
+                    "status": "pass",
+                    "details": "Ping test completed successfully",
+                    "execution_time": 8.0  # From the log
+                })
             
             return converted_results
             
@@ -1206,6 +1518,7 @@ class ApplicationGUI:
         """Cancel the file processing"""
         if self.processing:
             self.processing = False
+            self._cancel_event.set()
             self.log_message("Processing cancelled by user")
     
     def on_file_selected(self, event):
@@ -1225,68 +1538,90 @@ class ApplicationGUI:
         file_name = os.path.basename(file_path)
         
         # Clear detail table
-        for item in self.detail_table.get_children():
-            self.detail_table.delete(item)
+        self._clear_treeview(self.detail_table)
+        self._detail_file_index = item_idx
+        self._detail_test_cases = []
+        self._detail_results = []
+        self._detail_loaded = 0
         
-        # Load file and populate detail table
+        # Render the first page; further rows are added as the table is scrolled
         if file_name in self.file_data:
-            data = self.file_data[file_name]["data"]
-            test_cases = data.get("test_cases", [])
+            self._detail_test_cases = self.file_data[file_name]["data"].get("test_cases", [])
+            self._load_more_detail_rows()
+    
+    def _load_more_detail_rows(self):
+        """Insert the next page of test case rows into the detail table"""
+        self._detail_load_scheduled = False
+        start = self._detail_loaded
+        end = min(start + AppConfig.DETAIL_INSERT_CHUNK, len(self._detail_test_cases))
+        results = self._detail_results
+        
+        for i in range(start, end):
+            test_case = self._detail_test_cases[i]
+            service = test_case.get("service", "")
+            action = test_case.get("action", "-")
             
-            for i, test_case in enumerate(test_cases):
-                service = test_case.get("service", "")
-                action = test_case.get("action", "-")
-                
-                # Format parameters as a compact string
-                params = test_case.get("params", {})
-                params_str = self.format_params(params)
-                
-                # Status and details will be updated when results are available
+            # Format parameters as a compact string
+            params = test_case.get("params", {})
+            params_str = self.format_params(params)
+            
+            # Status and details are filled in once results are available
+            if i < len(results):
+                status = results[i].get("status", "Unknown")
+                details = results[i].get("details", "No details")
+            else:
                 status = "-"
                 details = "-"
-                
-                self.detail_table.insert("", "end", values=(service, action, params_str, status, details))
+            
+            self.detail_table.insert("", "end", iid=str(i), values=(service, action, params_str, status, details))
+        
+        self._detail_loaded = end
+    
+    def _on_detail_table_scroll(self, first, last):
+        """Update the scrollbar and render more rows when nearing the end of the table"""
+        self.detail_table_scrollbar.set(first, last)
+        
+        if (float(last) >= AppConfig.DETAIL_LOAD_THRESHOLD
+                and self._detail_loaded < len(self._detail_test_cases)
+                and not self._detail_load_scheduled):
+            self._detail_load_scheduled = True
+            self.root.after_idle(self._load_more_detail_rows)
     
     def update_detail_table_with_results(self, file_index: int, result_data: Dict):
         """Update detail table with test results if the file is currently selected"""
-        selection = self.file_table.selection()
-        if not selection:
-            return
-        
-        selected_index = self.file_table.index(selection[0])
-        if selected_index != file_index:
-            return  # Different file is selected
+        if file_index != self._detail_file_index:
+            return  # Different file (or none) is shown in the detail table
         
         test_results = result_data.get("test_results", [])
-        detail_items = self.detail_table.get_children()
+        self._detail_results = test_results  # Applied to rows rendered later
         
-        # Update each test case result
-        for i, result in enumerate(test_results):
-            if i < len(detail_items):
-                item_id = detail_items[i]
-                current_values = list(self.detail_table.item(item_id)["values"])
-                
-                # Update status and details
-                current_values[3] = result.get("status", "Unknown")  # Status column
-                current_values[4] = result.get("details", "No details")  # Details column
-                
-                self.root.after(0, lambda id=item_id, vals=current_values: self.detail_table.item(id, values=tuple(vals)))
+        # Collect the changed cells and apply them in a single UI callback
+        pending = [(result.get("status", "Unknown"), result.get("details", "No details")) for result in test_results]
+        self.root.after(0, self._apply_detail_results, file_index, pending)
+    
+    def _apply_detail_results(self, file_index: int, pending: List[Tuple[str, str]]):
+        """Write (status, details) pairs into the rendered detail rows"""
+        if file_index != self._detail_file_index:
+            return  # Selection changed before the update ran
+        
+        # Detail rows use the test case index as iid; only rendered rows are updated
+        for i, (status, details) in enumerate(pending[:self._detail_loaded]):
+            self.detail_table.set(str(i), "status", status)
+            self.detail_table.set(str(i), "details", details)
     
     def format_params(self, params):
         """Format parameters as a readable string"""
         if not params:
             return "-"
         
-        parts = []
-        
-        for k, v in params.items():
-            if isinstance(v, dict):
-                nested_parts = [f"{k2}={v2}" for k2, v2 in v.items()]
-                parts.append(f"{k}={{{', '.join(nested_parts)}}}")
-            else:
-                parts.append(f"{k}={v}")
-        
-        return ", ".join(parts)
+        return ", ".join(self._format_param(k, v) for k, v in params.items())
+    
+    @staticmethod
+    def _format_param(key, value) -> str:
+        """Format a single parameter, expanding one level of nested dicts"""
+        if value.__class__ is dict:
+            return f"{key}={{{', '.join(f'{k}={v}' for k, v in value.items())}}}"
+        return f"{key}={value}"
     
     def determine_overall_result(self, result_data):
         """Determine overall result from test result data"""
@@ -1308,28 +1643,51 @@ class ApplicationGUI:
     def update_file_status(self, file_index: int, status: str, result: str = "", time_str: str = ""):
         """Update file status in the table"""
         try:
-            items = self.file_table.get_children()
-            if file_index < len(items):
-                item_id = items[file_index]
-                current_values = list(self.file_table.item(item_id)["values"])
-                current_values[3] = status  # Status column
+            if file_index < len(self._file_items):
+                item_id = self._file_items[file_index]
+                changes = {"status": status}
                 if result:
-                    current_values[4] = result  # Result column
+                    changes["result"] = result
                 if time_str:
-                    current_values[5] = time_str  # Time column
+                    changes["time"] = time_str
                 
-                self.root.after(0, lambda: self.file_table.item(item_id, values=tuple(current_values)))
+                # Queue the change; one idle callback applies everything queued so far
+                self._status_buffer.append((item_id, changes))
+                if not self._status_flush_scheduled:
+                    self._status_flush_scheduled = True
+                    self.root.after_idle(self._flush_file_statuses)
         except Exception as e:
             self.logger.error(f"Error updating file status: {e}")
     
+    def _flush_file_statuses(self):
+        """Apply queued file status changes, merging several changes to the same row"""
+        self._status_flush_scheduled = False  # Cleared first so changes queued from now on schedule a new flush
+        merged = {}
+        try:
+            while True:
+                item_id, changes = self._status_buffer.popleft()
+                merged.setdefault(item_id, {}).update(changes)
+        except IndexError:
+            pass
+        
+        for item_id, changes in merged.items():
+            self._set_table_cells(self.file_table, item_id, changes)
+    
+    def _set_table_cells(self, tree: ttk.Treeview, item_id: str, changes: Dict[str, str]):
+        """Update only the given columns of a Treeview row"""
+        for column, value in changes.items():
+            tree.set(item_id, column, value)
+    
     def save_config(self):
         """Save configuration using database"""
         try:
-            self.database.save_setting("lan_ip", self.lan_ip_var.get())
-            self.database.save_setting("wan_ip", self.wan_ip_var.get())
-            self.database.save_setting("username", self.username_var.get())
-            self.database.save_setting("config_path", self.config_path_var.get())
-            self.database.save_setting("result_path", self.result_path_var.get())
+            self.database.save_settings({
+                "lan_ip": self.lan_ip_var.get(),
+                "wan_ip": self.wan_ip_var.get(),
+                "username": self.username_var.get(),
+                "config_path": self.config_path_var.get(),
+                "result_path": self.result_path_var.get(),
+            })
             
             self.log_message("Configuration saved successfully")
             messagebox.showinfo("Success", "Configuration saved successfully")
@@ -1342,11 +1700,12 @@ class ApplicationGUI:
     def load_config(self):
         """Load configuration from database"""
         try:
-            self.lan_ip_var.set(self.database.get_setting("lan_ip", "192.168.88.1"))
-            self.wan_ip_var.set(self.database.get_setting("wan_ip", ""))
-            self.username_var.set(self.database.get_setting("username", "root"))
-            self.config_path_var.set(self.database.get_setting("config_path", "/root/config"))
-            self.result_path_var.set(self.database.get_setting("result_path", "/root/result"))
+            settings = self.database.get_settings()
+            self.lan_ip_var.set(settings.get("lan_ip", "192.168.88.1"))
+            self.wan_ip_var.set(settings.get("wan_ip", ""))
+            self.username_var.set(settings.get("username", "root"))
+            self.config_path_var.set(settings.get("config_path", "/root/config"))
+            self.result_path_var.set(settings.get("result_path", "/root/result"))
             
             self.log_message("Configuration loaded successfully")
             
@@ -1358,42 +1717,55 @@ class ApplicationGUI:
     def load_history(self):
         """Load history from database"""
         try:
-            # Clear existing history
-            for item in self.history_table.get_children():
-                self.history_table.delete(item)
-            
             # Load recent history
-            history_data = self.database.get_recent_history(100)
+            history_data = self.database.get_recent_history(AppConfig.HISTORY_LIMIT)
+            self._populate_history_table(history_data)
             
-            for record in history_data:
-                timestamp = record["timestamp"]
-                if " " in timestamp:
-                    date, time_str = timestamp.split(" ", 1)
-                else:
-                    date = timestamp
-                    time_str = ""
-                
-                details = f"Execution time: {record['execution_time']:.1f}s" if record["execution_time"] else ""
-                if record["affects_wan"] or record["affects_lan"]:
-                    details += " (Network affecting)"
-                
-                self.history_table.insert("", "end", values=(
-                    date,
-                    time_str,
-                    record["file_name"],
-                    record["test_count"],
-                    record["overall_result"] or "Unknown",
-                    details
-                ))
-                
         except Exception as e:
             self.log_message(f"Error loading history: {str(e)}")
     
+    def _populate_history_table(self, history_data: List[Dict]):
+        """Replace the rows of the history table with the given history records"""
+        # Build every row before touching Tk, then clear and insert in one frozen update
+        rows = []
+        for record in history_data:
+            date, _, time_str = record["timestamp"].partition(" ")
+            
+            execution_time = record["execution_time"]
+            details = f"Execution time: {execution_time:.1f}s" if execution_time else ""
+            if record["affects_wan"] or record["affects_lan"]:
+                details = f"{details} {self.NETWORK_AFFECTING_NOTE}" if details else self.NETWORK_AFFECTING_NOTE
+            
+            rows.append((str(record["id"]), (
+                date,
+                time_str,
+                record["file_name"],
+                record["test_count"],
+                record["overall_result"] or "Unknown",
+                details
+            )))
+        
+        with self._frozen(self.history_table):
+            self._clear_treeview(self.history_table)
+            insert = self.history_table.insert
+            for iid, values in rows:
+                insert("", "end", iid=iid, values=values)
+    
     def check_remote_folders(self):
         """Check if remote folders exist and are accessible"""
         if not self.validate_connection_fields():
             return
         
+        if self._connection_recently_verified():
+            # The connection test already checked both folders exist and are writable
+            age = self._connection_verified_age()
+            config_path = self.config_path_var.get()
+            result_path = self.result_path_var.get()
+            messagebox.showinfo("Folder Check", f"Both folders were accessible {age:.0f}s ago (cached result):\n"
+                                                f"• {config_path}\n• {result_path}")
+            self.log_message(f"Remote folders verified {age:.0f}s ago - skipping check (cached result)")
+            return
+        
         self.log_message("Checking remote folders...")
         
         def _check_folders():
@@ -1407,31 +1779,32 @@ class ApplicationGUI:
                     if not success:
                         raise Exception("Failed to connect")
                 
-                # Check config folder
+                # Check both folders in one round-trip; the command prints the paths that are missing
                 config_path = self.config_path_var.get()
-                success, stdout, stderr = self.ssh_connection.execute_command(f"ls -ld {config_path}")
-                
-                if not success:
-                    raise Exception(f"Config folder not accessible: {stderr}")
-                
-                # Check result folder
                 result_path = self.result_path_var.get()
-                success, stdout, stderr = self.ssh_connection.execute_command(f"ls -ld {result_path}")
-                
+                success, stdout, stderr = self.ssh_connection.execute_command(
+                    f'for p in {shlex.quote(config_path)} {shlex.quote(result_path)}; do test -e "$p" || echo "$p"; done'
+                )
                 if not success:
-                    raise Exception(f"Result folder not accessible: {stderr}")
+                    raise Exception(f"Could not check folders: {stderr.strip()}")
+                
+                missing = set(stdout.splitlines())
+                if config_path in missing:
+                    raise Exception(f"Config folder not accessible: {config_path}")
+                if result_path in missing:
+                    raise Exception(f"Result folder not accessible: {result_path}")
                 
                 # Both folders accessible
                 message = f"Both folders are accessible:\n• {config_path}\n• {result_path}"
-                self.root.after(0, lambda: messagebox.showinfo("Folder Check", message))
-                self.root.after(0, lambda: self.log_message("Remote folders check successful"))
+                self.root.after(0, messagebox.showinfo, "Folder Check", message)
+                self.root.after(0, self.log_message, "Remote folders check successful")
                 
             except Exception as e:
                 error_msg = f"Folder check failed: {str(e)}"
-                self.root.after(0, lambda: messagebox.showerror("Folder Check", error_msg))
-                self.root.after(0, lambda: self.log_message(error_msg))
+                self.root.after(0, messagebox.showerror, "Folder Check", error_msg)
+                self.root.after(0, self.log_message, error_msg)
         
-        threading.Thread(target=_check_folders, daemon=True).start()
+        self.run_in_background(_check_folders)
     
     # ============================================================================
     # UTILITY METHODS
@@ -1442,21 +1815,67 @@ class ApplicationGUI:
         self.selected_files = []
         self.file_data = {}
         self.file_retry_count = {}
+        self._file_load_generation += 1
+        self._file_items = ()
+        self._detail_file_index = -1
         
-        for item in self.file_table.get_children():
-            self.file_table.delete(item)
-        
-        for item in self.detail_table.get_children():
-            self.detail_table.delete(item)
+        self._clear_treeview(self.file_table)
+        self._clear_treeview(self.detail_table)
         
         self.log_message("File selection cleared")
     
+    def _clear_treeview(self, tree: ttk.Treeview):
+        """Remove all rows from a Treeview in a single Tcl call"""
+        children = tree.get_children()
+        if children:
+            tree.delete(*children)
+    
+    @contextmanager
+    def _frozen(self, widget: tk.Widget):
+        """Unmap a widget for the duration of a bulk update so it is laid out and drawn once"""
+        manager = widget.winfo_manager()
+        if manager not in ("pack", "grid"):
+            yield
+            return
+        
+        if manager == "pack":
+            # Remember pack options and position so the widget is restored in place
+            info = widget.pack_info()
+            siblings = widget.master.pack_slaves()
+            following = siblings[siblings.index(widget) + 1:]
+            if following:
+                info["before"] = following[0]
+            widget.pack_forget()
+        else:
+            info = widget.grid_info()
+            widget.grid_forget()
+        
+        try:
+            yield
+        finally:
+            if manager == "pack":
+                widget.pack(**info)
+            else:
+                widget.grid(**info)
+    
+    def _bulk_insert(self, tree: ttk.Treeview, rows: List[Tuple]):
+        """Insert many rows with the Treeview frozen"""
+        if not rows:
+            return
+        
+        with self._frozen(tree):
+            for values in rows:
+                tree.insert("", "end", values=values)
+    
     def validate_connection_fields(self) -> bool:
         """Validate connection fields with enhanced error messages"""
         validation_errors = []
+        lan_ip = self.lan_ip_var.get().strip()
         
-        if not self.lan_ip_var.get().strip():
+        if not lan_ip:
             validation_errors.append("LAN IP address is required")
+        elif not self.IP_PATTERN.fullmatch(lan_ip):
+            validation_errors.append("LAN IP address format is invalid")
         
         if not self.username_var.get().strip():
             validation_errors.append("Username is required")
@@ -1470,13 +1889,6 @@ class ApplicationGUI:
         if not self.result_path_var.get().strip():
             validation_errors.append("Result path is required")
         
-        # Validate IP format (basic check)
-        lan_ip = self.lan_ip_var.get().strip()
-        if lan_ip:
-            parts = lan_ip.split('.')
-            if len(parts) != 4 or not all(part.isdigit() and 0 <= int(part) <= 255 for part in parts):
-                validation_errors.append("LAN IP address format is invalid")
-        
         if validation_errors:
             error_msg = "Please fix the following errors:\n\n" + "\n".join(f"• {error}" for error in validation_errors)
             messagebox.showerror("Validation Error", error_msg)
@@ -1484,30 +1896,62 @@ class ApplicationGUI:
         
         return True
     
+    def _set_connection_status(self, text: str):
+        """Set the status bar text, skipping the write when it is unchanged"""
+        if self.connection_status.get() != text:
+            self.connection_status.set(text)
+    
+    def _set_progress(self, percent: int):
+        """Set the progress bar value directly, skipping unchanged writes"""
+        if percent != self._last_progress:
+            self._last_progress = percent
+            self.progress_bar.configure(value=percent)
+    
     def update_status_circle(self, color: str):
         """Update connection status circle color with enhanced visual feedback"""
-        color_mapping = {
-            "green": "#00AA00",    # Success
-            "yellow": "#FFB000",   # Warning/Connecting
-            "red": "#CC0000",      # Error
-            "gray": "#808080"      # Disabled
-        }
+        actual_color = self.COLOR_MAP.get(color, color)
+        if actual_color == self._status_circle_color:
+            return  # Skip the Tk call and redraw when nothing changes
         
-        actual_color = color_mapping.get(color, color)
+        self._status_circle_color = actual_color
         self.status_canvas.itemconfig(self.status_circle, fill=actual_color)
     
     def log_message(self, message: str):
         """Add a message to the log with timestamp and improved formatting"""
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
+        date_str, time_str = timestamp_parts()
+        log_entry = f"[{date_str} {time_str}] {message}\n"
         
-        # Add to GUI log
-        self.log_text.insert(tk.END, log_entry)
-        self.log_text.see(tk.END)  # Scroll to the bottom
+        # Add to GUI log; the flush timer writes buffered entries in batches
+        self._log_lines.append(log_entry)
+        self._log_buffer.append(log_entry)
         
         # Also log to file logger
         self.logger.info(message)
     
+    def _flush_log_buffer(self):
+        """Write all buffered log entries to the log widget in one insert, then reschedule"""
+        entries = []
+        try:
+            while True:
+                entries.append(self._log_buffer.popleft())
+        except IndexError:
+            pass
+        
+        if entries:
+            text = "".join(entries)
+            self.log_text.insert(tk.END, text)
+            self._log_widget_lines += text.count("\n")
+            
+            # Drop the oldest lines in one delete once the cap is exceeded by a full batch
+            excess = self._log_widget_lines - AppConfig.MAX_LOG_WIDGET_LINES
+            if excess >= AppConfig.LOG_TRIM_BATCH:
+                self.log_text.delete("1.0", f"{excess + 1}.0")
+                self._log_widget_lines -= excess
+            
+            self.log_text.see(tk.END)  # Scroll to the bottom
+        
+        self.root.after(AppConfig.LOG_FLUSH_INTERVAL_MS, self._flush_log_buffer)
+    
     def on_closing(self):
         """Handle application closing with cleanup"""
         if self.processing:
@@ -1523,18 +1967,29 @@ class ApplicationGUI:
                 return
             elif result:  # Yes - wait for completion
                 self.processing = False
+                self._cancel_event.set()
                 self.log_message("Waiting for current operation to complete...")
                 # The processing thread will handle cleanup
             else:  # No - immediate exit
                 self.processing = False
+                self._cancel_event.set()
+                self._flush_pending_settings()
                 self.ssh_connection.disconnect()
+                self._io_pool.shutdown(wait=False, cancel_futures=True)
+                self.database.close()
                 self.logger.info("Application closed by user (immediate)")
                 self.root.destroy()
                 return
         
         # Normal close
         try:
+            self._flush_pending_settings()
             self.ssh_connection.disconnect()
+            # Queued jobs are dropped; a running one finishes its database call before close()
+            # returns, and anything after that fails instead of reopening the database. Waiting
+            # for the pool here could deadlock on jobs that call back into Tk.
+            self._io_pool.shutdown(wait=False, cancel_futures=True)
+            self.database.close()
             self.logger.info("Application closed normally by juno-kyojin")
         except Exception as e:
             self.logger.warning(f"Error during cleanup: {e}")
@@ -1553,12 +2008,28 @@ class ApplicationGUI:
             title="Export Results"
         )
         if filename:
-            try:
-                # TODO: Implement actual CSV export
-                self.log_message(f"Exporting results to {filename}...")
-                messagebox.showinfo("Export", f"Results exported to {filename}")
-            except Exception as e:
-                messagebox.showerror("Export Error", f"Failed to export results: {str(e)}")
+            self.log_message(f"Exporting results to {filename}...")
+            self._export_treeview_csv(self.file_table, filename, "results", "Results")
+    
+    def _export_treeview_csv(self, tree: ttk.Treeview, filename: str, noun: str, title: str):
+        """Snapshot a Treeview's headings and rows, then write them to CSV on the I/O pool"""
+        header = [tree.heading(column, "text") for column in tree["columns"]]
+        rows = [tree.item(item_id, "values") for item_id in tree.get_children()]
+        self._io_pool.submit(self._write_csv, filename, header, rows, noun, title)
+    
+    def _write_csv(self, filename: str, header: List[str], rows: List[Tuple], noun: str, title: str):
+        """Write CSV rows off the UI thread and report the outcome"""
+        try:
+            with open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
+        except Exception as e:
+            self.root.after(0, messagebox.showerror, "Export Error", f"Failed to export {title.lower()}: {str(e)}")
+            return
+        
+        self.log_message(f"Exported {len(rows)} {noun} to {filename}")
+        self.root.after(0, messagebox.showinfo, "Export", f"{title} exported to {filename}")
     
     def refresh_view(self):
         """Refresh all views"""
@@ -1574,8 +2045,7 @@ class ApplicationGUI:
         if confirm:
             try:
                 # TODO: Add database method to clear history
-                for item in self.history_table.get_children():
-                    self.history_table.delete(item)
+                self._clear_treeview(self.history_table)
                 self.log_message("History cleared from view")
                 messagebox.showinfo("Success", "History cleared successfully")
             except Exception as e:
@@ -1587,8 +2057,13 @@ class ApplicationGUI:
         status_filter = self.status_combo.get()
         
         self.log_message(f"Applying history filter: Date={date_filter}, Status={status_filter}")
-        # TODO: Implement actual filtering logic
-        messagebox.showinfo("Filter", f"Applied filter: {date_filter}, {status_filter}")
+        
+        try:
+            history_data = self.database.get_filtered_history(date_filter, status_filter, AppConfig.HISTORY_LIMIT)
+            self._populate_history_table(history_data)
+            self.log_message(f"History filter matched {len(history_data)} records")
+        except Exception as e:
+            self.log_message(f"Error applying history filter: {str(e)}")
     
     def clear_history_filter(self):
         """Clear history filters"""
@@ -1605,12 +2080,8 @@ class ApplicationGUI:
             title="Export History"
         )
         if filename:
-            try:
-                # TODO: Implement actual history CSV export
-                self.log_message(f"Exporting history to {filename}...")
-                messagebox.showinfo("Export", f"History exported to {filename}")
-            except Exception as e:
-                messagebox.showerror("Export Error", f"Failed to export history: {str(e)}")
+            self.log_message(f"Exporting history to {filename}...")
+            self._export_treeview_csv(self.history_table, filename, "history records", "History")
     
     def view_history_details(self):
         """View detailed information for selected history item"""
@@ -1620,16 +2091,84 @@ class ApplicationGUI:
             return
         
         item_id = selection[0]
-        filename = self.history_table.item(item_id)["values"][2]  # Filename column
+        result_id = int(item_id)  # History rows use the test_files ID as iid
+        filename = self.history_table.set(item_id, "file")
+        
+        details = self.database.get_test_details(result_id)
+        if not details:
+            messagebox.showinfo("Details", f"No test case results stored for {filename}")
+            return
+        
+        self._show_history_details_window(filename, details)
+    
+    def _show_history_details_window(self, filename: str, details: List[Dict]):
+        """Show test case results for a history item in a popup window"""
+        window = tk.Toplevel(self.root)
+        window.title(f"Test Details - {filename}")
+        window.geometry("750x400")
+        
+        tree_frame = ttk.Frame(window)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        details_table = ttk.Treeview(
+            tree_frame,
+            columns=("service", "action", "status", "details", "time"),
+            show="headings",
+            selectmode="browse"
+        )
+        
+        details_table.heading("service", text="Service")
+        details_table.heading("action", text="Action")
+        details_table.heading("status", text="Status")
+        details_table.heading("details", text="Details")
+        details_table.heading("time", text="Time (s)")
+        
+        details_table.column("service", width=100, minwidth=80)
+        details_table.column("action", width=100, minwidth=80)
+        details_table.column("status", width=80, minwidth=60)
+        details_table.column("details", width=350, minwidth=200)
+        details_table.column("time", width=80, minwidth=60)
+        
+        details_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=details_table.yview)
+        details_table.configure(yscrollcommand=details_scrollbar.set)
+        
+        details_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        details_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Configure tags before inserting so rows pick up colors immediately
+        details_table.tag_configure("pass", foreground="green")
+        details_table.tag_configure("fail", foreground="red")
+        details_table.tag_configure("error", foreground="orange")
+        
+        rows = [
+            ((t.get("service", ""), t.get("action", ""), (t.get("status") or "").capitalize(),
+              t.get("details", ""), f"{t.get('execution_time') or 0:.2f}"),
+             ((t.get("status") or "unknown").lower(),))
+            for t in details
+        ]
+        self._insert_rows_chunked(details_table, rows)
+        
+        ttk.Button(window, text="Close", command=window.destroy).pack(pady=(0, 10))
+    
+    def _insert_rows_chunked(self, tree: ttk.Treeview, rows: List[Tuple], start: int = 0):
+        """Insert (values, tags) rows in chunks, yielding to the event loop between chunks"""
+        if not tree.winfo_exists():
+            return
+        
+        end = start + AppConfig.DETAIL_INSERT_CHUNK
+        for values, tags in rows[start:end]:
+            tree.insert("", "end", values=values, tags=tags)
         
-        # TODO: Implement detailed history view window
-        messagebox.showinfo("Details", f"Detailed view for {filename}\n\n(Feature coming soon)")
+        if end < len(rows):
+            self.root.after_idle(self._insert_rows_chunked, tree, rows, end)
     
     def clear_logs(self):
         """Clear the log display"""
         confirm = messagebox.askyesno("Clear Logs", "Clear all log messages from display?")
         if confirm:
             self.log_text.delete("1.0", tk.END)
+            self._log_widget_lines = 0
+            self._log_lines.clear()
             self.log_message("Log display cleared")
     
     def export_logs(self):
@@ -1641,8 +2180,10 @@ class ApplicationGUI:
         )
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(self.log_text.get("1.0", tk.END))
+                # Snapshot first: worker threads may append while we export
+                data = "".join(list(self._log_lines)).encode('utf-8')
+                with open(filename, 'wb') as f:
+                    f.write(data)
                 messagebox.showinfo("Export", f"Logs exported to {filename}")
                 self.log_message(f"Logs exported to {filename}")
             except Exception as e:
@@ -2,18 +2,62 @@
 # Purpose: SSH connection with SCP support for OpenWrt
 
 import paramiko
+import io
 import logging
+import re
+import select
+import shlex
+import socket
 import time
 import os
 import subprocess
 import tempfile
-from typing import Optional, Tuple
+import threading
+import uuid
+from typing import List, Optional, Tuple
+
+# Streams names of new files in a directory, one per line. Uses inotifywait when installed,
+# otherwise diffs the listing once a second on the router so the client needs no polling
+WATCH_SCRIPT = """d={remote_dir}
+if command -v inotifywait >/dev/null 2>&1; then
+    exec inotifywait -m -q -e close_write,moved_to --format '%f' "$d" 2>/dev/null
+fi
+prev=$(ls -1 "$d" 2>/dev/null)
+while sleep 1; do
+    cur=$(ls -1 "$d" 2>/dev/null)
+    [ "$cur" != "$prev" ] && printf '%s\\n' "$cur" | grep -vxF -e "$prev"
+    prev=$cur
+done"""
+
+def _parse_marked_output(stdout_data: bytes, stderr_data: bytes, marker: str) -> Optional[Tuple[int, bytes, bytes]]:
+    """
+    Split output of a persistent-shell command at its end markers: stdout ends with
+    "\\n<marker> <status>\\n" and stderr with "\\n<marker>\\n".
+    Returns (exit status, stdout, stderr), or None until both markers have fully arrived
+    """
+    marker_bytes = marker.encode()
+    status = re.search(b"\n" + re.escape(marker_bytes) + rb" (\d+)\n", stdout_data)
+    stderr_end = stderr_data.find(b"\n" + marker_bytes + b"\n")
+    if status is None or stderr_end < 0:
+        return None
+    return int(status.group(1)), stdout_data[:status.start()], stderr_data[:stderr_end]
 
 class SSHConnection:
+    # Seconds a successful round-trip is trusted before is_connected probes again
+    LIVENESS_WINDOW = 5.0
+    # Seconds between SSH keepalive packets, so idle sessions survive NAT and firewall timeouts
+    KEEPALIVE_INTERVAL = 30
+    
     def __init__(self):
         self.client = None
         self.logger = logging.getLogger(__name__)
         self.connected = False
+        self._last_ok_ts = 0.0
+        self._clock_offset = None  # Remote clock minus local clock, measured at connect
+        self._sftp = None
+        self._sftp_unavailable = False  # Set when the server has no SFTP subsystem
+        self._shell = None
+        self._shell_lock = threading.Lock()
         self.hostname = None
         self.username = None
         self.password = None
@@ -44,13 +88,19 @@ class SSHConnection:
                 allow_agent=False,
                 look_for_keys=False
             )
+            # Keep the one session open between actions instead of reconnecting after idle periods
+            self.client.get_transport().set_keepalive(self.KEEPALIVE_INTERVAL)
             
-            # Test connection
-            stdin, stdout, stderr = self.client.exec_command("echo 'connection_test'", timeout=5)
-            result = stdout.read().decode().strip()
+            # Test connection, reading the router's clock in the same round-trip
+            stdin, stdout, stderr = self.client.exec_command("echo 'connection_test'; date +%s", timeout=5)
+            lines = stdout.read().decode().split()
+            result = lines[0] if lines else ""
             
             if result == "connection_test":
+                if len(lines) > 1 and lines[1].isdigit():
+                    self._clock_offset = int(lines[1]) - time.time()
                 self.connected = True
+                self._last_ok_ts = time.monotonic()
                 self.logger.info("SSH connection established successfully")
                 return True
             else:
@@ -63,27 +113,48 @@ class SSHConnection:
     
     def disconnect(self):
         """Close SSH connection"""
+        # Each resource is closed on its own: once the transport has dropped, closing one may fail
+        try:
+            if self._sftp:
+                self._sftp.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing SFTP session: {e}")
+        
+        self._close_shell()
+        
         try:
             if self.client:
                 self.client.close()
-                self.client = None
+            self.logger.info("SSH connection closed")
+        except Exception as e:
+            self.logger.error(f"Error closing connection: {e}")
+        finally:
+            self.client = None
+            self._sftp = None
+            self._sftp_unavailable = False
             self.connected = False
+            self._last_ok_ts = 0.0
+            self._clock_offset = None
             self.hostname = None
             self.username = None
             self.password = None
-            self.logger.info("SSH connection closed")
-        except Exception as e:
-            self.logger.error(f"Error closing connection: {e}")
     
     def is_connected(self) -> bool:
         """Check if connection is still active"""
         if not self.connected or not self.client:
             return False
         
+        # Skip the keepalive probe if the session was proven alive recently
+        if time.monotonic() - self._last_ok_ts < self.LIVENESS_WINDOW:
+            return True
+        
         try:
             stdin, stdout, stderr = self.client.exec_command("echo 'keepalive'", timeout=3)
             result = stdout.read().decode().strip()
-            return result == "keepalive"
+            if result == "keepalive":
+                self._last_ok_ts = time.monotonic()
+                return True
+            return False
         except:
             self.connected = False
             return False
@@ -94,28 +165,123 @@ class SSHConnection:
             return False, "", "Not connected"
         
         try:
+            with self._shell_lock:
+                shell = self._get_shell()
+                result = self._run_in_shell(shell, command, timeout) if shell is not None else None
+                if result is not None:
+                    self._last_ok_ts = time.monotonic()
+                    return result
+            
             stdin, stdout, stderr = self.client.exec_command(command, timeout=timeout)
             
             stdout_data = stdout.read().decode('utf-8', errors='replace')
             stderr_data = stderr.read().decode('utf-8', errors='replace')
             exit_code = stdout.channel.recv_exit_status()
+            self._last_ok_ts = time.monotonic()
             
             success = exit_code == 0
             return success, stdout_data, stderr_data
             
         except Exception as e:
             self.logger.error(f"Command execution error: {e}")
+            if self._is_transport_failure(e):
+                # Force the next is_connected() call to report the session as dead
+                self.connected = False
+                self._last_ok_ts = 0.0
             return False, "", str(e)
     
+    def _is_transport_failure(self, error: Exception) -> bool:
+        """Whether an error means the SSH session is gone, rather than just this command failing"""
+        transport = self.client.get_transport() if self.client else None
+        if transport is None or not transport.is_active():
+            return True
+        if isinstance(error, (socket.timeout, TimeoutError)):
+            return False  # A slow command; the session is still up
+        if isinstance(error, paramiko.ChannelException):
+            return False  # One channel was refused (e.g. session limit); the transport is fine
+        return isinstance(error, (paramiko.SSHException, socket.error))
+    
+    def _get_shell(self) -> Optional[paramiko.Channel]:
+        """Return the persistent remote shell, starting it if needed; None if it can't be started"""
+        if self._shell is not None and not self._shell.exit_status_ready():
+            return self._shell
+        
+        self._close_shell()
+        try:
+            # A plain sh on an exec channel: no pty, so no echo or prompts to strip
+            channel = self.client.get_transport().open_session()
+            channel.exec_command("/bin/sh")
+            self._shell = channel
+        except Exception as e:
+            self.logger.warning(f"Persistent shell unavailable, opening a channel per command: {e}")
+        return self._shell
+    
+    def _close_shell(self):
+        """Close the persistent remote shell, if any"""
+        if self._shell is not None:
+            try:
+                self._shell.close()
+            except Exception:
+                pass
+            self._shell = None
+    
+    def _run_in_shell(self, shell: paramiko.Channel, command: str, timeout: int) -> Optional[Tuple[bool, str, str]]:
+        """
+        Run one command in the persistent shell and collect its output up to an end marker.
+        The command is handed to a child sh -c as one quoted word, so a syntax error or unbalanced
+        quote only fails that child, and stdin is closed so it can't consume the commands that follow.
+        Returns None if the shell died, so the caller can run the command on its own channel.
+        """
+        # Discard anything left over from an earlier command (e.g. a background child's output)
+        while shell.recv_ready():
+            shell.recv(65536)
+        while shell.recv_stderr_ready():
+            shell.recv_stderr(65536)
+        
+        marker = f"__END_{uuid.uuid4().hex}__"
+        # Markers go on their own lines so they're found even after output without a final newline
+        shell.sendall(f"sh -c {shlex.quote(command)} </dev/null; "
+                      f"printf '\\n{marker} %d\\n' $?; printf '\\n{marker}\\n' >&2\n".encode())
+        
+        stdout_data, stderr_data = b"", b""
+        deadline = time.monotonic() + timeout
+        while True:
+            parsed = _parse_marked_output(stdout_data, stderr_data, marker)
+            if parsed is not None:
+                break
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # The command may still be running; start a fresh shell next time
+                self._close_shell()
+                raise TimeoutError(f"Command timed out after {timeout}s")
+            closed = shell.exit_status_ready() and not shell.recv_ready() and not shell.recv_stderr_ready()
+            if not closed:
+                select.select([shell], [], [], min(remaining, 1.0))
+                if shell.recv_ready():
+                    chunk = shell.recv(65536)
+                    closed = not chunk  # Empty read: the channel reached EOF
+                    stdout_data += chunk
+                if shell.recv_stderr_ready():
+                    stderr_data += shell.recv_stderr(65536)
+            
+            if closed:
+                self.logger.warning("Persistent shell exited, running the command on its own channel")
+                self._close_shell()
+                return None
+        
+        exit_code, stdout_data, stderr_data = parsed
+        return exit_code == 0, stdout_data.decode('utf-8', errors='replace'), stderr_data.decode('utf-8', errors='replace')
+    
     def ensure_remote_directory(self, remote_dir: str) -> bool:
         """Ensure remote directory exists"""
         try:
-            success, stdout, stderr = self.execute_command(f"mkdir -p '{remote_dir}'")
+            success, stdout, stderr = self.execute_command(f"mkdir -p {shlex.quote(remote_dir)}")
             if not success:
                 self.logger.error(f"Failed to create directory {remote_dir}: {stderr}")
                 return False
             
-            success, stdout, stderr = self.execute_command(f"chmod 755 '{remote_dir}'")
+            success, stdout, stderr = self.execute_command(f"chmod 755 {shlex.quote(remote_dir)}")
             if not success:
                 self.logger.warning(f"Failed to set permissions on {remote_dir}: {stderr}")
             
@@ -126,6 +292,29 @@ class SSHConnection:
             self.logger.error(f"Error ensuring directory {remote_dir}: {e}")
             return False
     
+    def upload_file_via_sftp(self, local_path: str, remote_path: str) -> bool:
+        """Upload file over the connection's SFTP session"""
+        sftp = self.get_sftp()
+        if sftp is None:
+            return False
+        
+        try:
+            remote_dir = os.path.dirname(remote_path)
+            if remote_dir and remote_dir != '/':
+                if not self.ensure_remote_directory(remote_dir):
+                    return False
+            
+            # Test files are small (<= 1 MB): read once and send from memory with writes pipelined
+            with open(local_path, 'rb') as f:
+                data = f.read()
+            sftp.putfo(io.BytesIO(data), remote_path, file_size=len(data))
+            self._last_ok_ts = time.monotonic()
+            self.logger.info(f"File uploaded via SFTP: {local_path} -> {remote_path}")
+            return True
+        except Exception as e:
+            self.logger.warning(f"SFTP upload failed: {e}")
+            return False
+    
     def upload_file_via_scp(self, local_path: str, remote_path: str) -> bool:
         """Upload file using scp command"""
         try:
@@ -253,11 +442,8 @@ exit 0
                 if not self.ensure_remote_directory(remote_dir):
                     return False
             
-            # Escape content for shell
-            content_escaped = content.replace("'", "'\"'\"'")
-            
-            # Write file using cat
-            command = f"cat > '{remote_path}' << 'EOF_CONTENT_MARKER'\n{content}\nEOF_CONTENT_MARKER"
+            # Write file using cat; the quoted heredoc marker keeps the content from being expanded
+            command = f"cat > {shlex.quote(remote_path)} << 'EOF_CONTENT_MARKER'\n{content}\nEOF_CONTENT_MARKER"
             
             success, stdout, stderr = self.execute_command(command, timeout=60)
             
@@ -276,11 +462,15 @@ exit 0
         """Upload file with multiple methods"""
         self.logger.info(f"Attempting to upload: {local_path} -> {remote_path}")
         
-        # Method 1: Try SCP (preferred)
+        # Method 1: SFTP over the existing connection (no new SSH handshake)
+        if self.upload_file_via_sftp(local_path, remote_path):
+            return True
+        
+        # Method 2: Try SCP
         if self.upload_file_via_scp(local_path, remote_path):
             return True
         
-        # Method 2: Fallback to SSH cat for text files
+        # Method 3: Fallback to SSH cat for text files
         try:
             if self.upload_file_via_ssh_cat(local_path, remote_path):
                 return True
@@ -290,6 +480,25 @@ exit 0
         self.logger.error("All upload methods failed")
         return False
     
+    def download_file_via_sftp(self, remote_path: str, local_path: str) -> bool:
+        """Download file over the connection's SFTP session"""
+        sftp = self.get_sftp()
+        if sftp is None:
+            return False
+        
+        try:
+            local_dir = os.path.dirname(local_path)
+            if local_dir:
+                os.makedirs(local_dir, exist_ok=True)
+            
+            sftp.get(remote_path, local_path)
+            self._last_ok_ts = time.monotonic()
+            self.logger.info(f"File downloaded via SFTP: {remote_path} -> {local_path}")
+            return True
+        except Exception as e:
+            self.logger.warning(f"SFTP download failed: {e}")
+            return False
+    
     def download_file_via_scp(self, remote_path: str, local_path: str) -> bool:
         """Download file using scp command"""
         try:
@@ -398,7 +607,7 @@ exit 0
     def download_file_via_ssh_cat(self, remote_path: str, local_path: str) -> bool:
         """Download file using SSH cat command"""
         try:
-            success, content, stderr = self.execute_command(f"cat '{remote_path}'")
+            success, content, stderr = self.execute_command(f"cat {shlex.quote(remote_path)}")
             
             if success:
                 # Ensure local directory exists
@@ -424,33 +633,157 @@ exit 0
         """Download file with multiple methods"""
         self.logger.info(f"Attempting to download: {remote_path} -> {local_path}")
         
-        # Method 1: Try SCP (preferred)
+        # Method 1: SFTP over the existing connection (no new SSH handshake)
+        if self.download_file_via_sftp(remote_path, local_path):
+            return True
+        
+        # Method 2: Try SCP
         if self.download_file_via_scp(remote_path, local_path):
             return True
         
-        # Method 2: Fallback to SSH cat
+        # Method 3: Fallback to SSH cat
         if self.download_file_via_ssh_cat(remote_path, local_path):
             return True
         
         self.logger.error("All download methods failed")
         return False
     
+    def get_sftp(self) -> Optional[paramiko.SFTPClient]:
+        """Return a cached SFTP client, or None if the server doesn't offer SFTP"""
+        if self._sftp is None and not self._sftp_unavailable and self.is_connected():
+            try:
+                self._sftp = self.client.open_sftp()
+            except Exception as e:
+                # Plain dropbear builds ship without sftp-server; stay on shell commands
+                self.logger.info(f"SFTP unavailable, using shell commands: {e}")
+                self._sftp_unavailable = True
+        return self._sftp
+    
+    def list_directory(self, remote_dir: str) -> Optional[List[paramiko.SFTPAttributes]]:
+        """
+        List a remote directory with name, size and mtime in one round-trip.
+        Uses SFTP when available, otherwise a single stat command; None if the listing fails
+        """
+        sftp = self.get_sftp()
+        if sftp is not None:
+            try:
+                attrs = sftp.listdir_attr(remote_dir)
+                self._last_ok_ts = time.monotonic()
+                return attrs
+            except Exception as e:
+                self.logger.warning(f"SFTP listing of {remote_dir} failed, using stat: {e}")
+        
+        # One line per entry: "<mtime> <size> <name>"; an empty directory leaves the glob unmatched
+        success, stdout, stderr = self.execute_command(
+            f"cd {shlex.quote(remote_dir)} || exit 1; stat -c '%Y %s %n' -- * 2>/dev/null; exit 0"
+        )
+        if not success:
+            return None
+        
+        attrs = []
+        for line in stdout.splitlines():
+            parts = line.split(" ", 2)
+            if len(parts) == 3 and parts[0].isdigit() and parts[1].isdigit():
+                attr = paramiko.SFTPAttributes()
+                attr.st_mtime = int(parts[0])
+                attr.st_size = int(parts[1])
+                attr.filename = parts[2]
+                attrs.append(attr)
+        return attrs
+    
     def file_exists(self, remote_path: str) -> bool:
-        """Check if file exists using ls command"""
+        """Check if file exists using SFTP stat, or ls when SFTP is unavailable"""
+        sftp = self.get_sftp()
+        if sftp is not None:
+            try:
+                sftp.stat(remote_path)
+                return True
+            except IOError:
+                return False
+            except Exception as e:
+                self.logger.warning(f"SFTP stat failed, falling back to ls: {e}")
+        
         try:
-            success, stdout, stderr = self.execute_command(f"ls '{remote_path}' 2>/dev/null")
+            success, stdout, stderr = self.execute_command(f"ls {shlex.quote(remote_path)} 2>/dev/null")
             return success and stdout.strip() != ""
         except Exception as e:
             self.logger.error(f"Error checking file existence: {e}")
             return False
     
+    def stat_file(self, remote_path: str) -> Optional[paramiko.SFTPAttributes]:
+        """
+        Get a file's or directory's size and mtime in one round-trip, using SFTP stat or the stat command
+        when SFTP is unavailable; None if the path is missing
+        """
+        sftp = self.get_sftp()
+        if sftp is not None:
+            try:
+                return sftp.stat(remote_path)
+            except IOError:
+                return None
+            except Exception as e:
+                self.logger.warning(f"SFTP stat failed, falling back to stat command: {e}")
+        
+        try:
+            success, stdout, stderr = self.execute_command(f"stat -c '%Y %s' {shlex.quote(remote_path)} 2>/dev/null")
+            parts = stdout.split()
+            if success and len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+                attr = paramiko.SFTPAttributes()
+                attr.st_mtime = int(parts[0])
+                attr.st_size = int(parts[1])
+                return attr
+            return None
+        except Exception as e:
+            self.logger.error(f"Error getting file status: {e}")
+            return None
+    
     def get_file_size(self, remote_path: str) -> int:
-        """Get file size using stat command"""
+        """Get file size, 0 if missing"""
+        attr = self.stat_file(remote_path)
+        return (attr.st_size or 0) if attr is not None else 0
+    
+    def to_remote_time(self, local_ts: float) -> float:
+        """Convert a local time.time() value to the router's clock; unchanged if its clock is unknown"""
+        return local_ts + (self._clock_offset or 0.0)
+    
+    def remote_time(self) -> Optional[float]:
+        """Current time on the router's clock, or None if it couldn't be read at connect"""
+        if self._clock_offset is None:
+            return None
+        return time.time() + self._clock_offset
+    
+    def open_watch(self, remote_dir: str) -> Optional[paramiko.Channel]:
+        """
+        Start watching a remote directory and return the channel streaming new file names.
+        The channel exits if the session drops; callers check exit_status_ready().
+        """
+        if not self.is_connected():
+            return None
+        
         try:
-            success, stdout, stderr = self.execute_command(f"stat -c%s '{remote_path}' 2>/dev/null")
-            if success and stdout.strip().isdigit():
-                return int(stdout.strip())
-            return 0
+            channel = self.client.get_transport().open_session()
+            channel.exec_command(WATCH_SCRIPT.format(remote_dir=shlex.quote(remote_dir)))
+            return channel
         except Exception as e:
-            self.logger.error(f"Error getting file size: {e}")
-            return 0
\ No newline at end of file
+            self.logger.warning(f"Could not start directory watch on {remote_dir}: {e}")
+            return None
+    
+    def read_watch_events(self, channel: paramiko.Channel, timeout: float) -> List[str]:
+        """Wait up to timeout seconds for file names reported by a watch channel"""
+        readable, _, _ = select.select([channel], [], [], timeout)
+        if not readable:
+            return []
+        
+        data = b""
+        while True:
+            chunk = channel.recv(4096)
+            if not chunk:
+                break  # Watch exited
+            data += chunk
+            # Names are newline-terminated; finish any line split across packets
+            if data.endswith(b"\n") or not select.select([channel], [], [], 1.0)[0]:
+                break
+        
+        if data:
+            self._last_ok_ts = time.monotonic()
+        return [name for name in data.decode('utf-8', errors='replace').split("\n") if name]
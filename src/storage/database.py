@@ -4,13 +4,87 @@
 import sqlite3
 import logging
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+# SQL statements kept as constants so sqlite3's per-connection statement cache can reuse them
+SQL_INSERT_CONNECTION_LOG = """
+    INSERT INTO connection_log (target_ip, connection_type, status, details)
+    VALUES (?, ?, ?, ?)
+"""
+
+SQL_INSERT_TEST_FILE = """
+    INSERT INTO test_files 
+    (file_name, file_size, test_count, send_status, overall_result, 
+     affects_wan, affects_lan, execution_time, target_ip, target_username)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_INSERT_TEST_CASE_RESULT = """
+    INSERT INTO test_case_results 
+    (test_file_id, service, action, status, details, execution_time)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Only the columns shown in the history table are read
+HISTORY_COLUMNS = "id, timestamp, file_name, test_count, overall_result, execution_time, affects_wan, affects_lan"
+
+SQL_SELECT_RECENT_HISTORY = f"""
+    SELECT {HISTORY_COLUMNS} FROM test_files 
+    ORDER BY timestamp DESC 
+    LIMIT ?
+"""
+
+SQL_SELECT_FILTERED_HISTORY = f"""
+    SELECT {HISTORY_COLUMNS} FROM test_files 
+    WHERE {{where}}
+    ORDER BY timestamp DESC 
+    LIMIT ?
+"""
+
+SQL_SELECT_TEST_CASE_RESULTS = """
+    SELECT service, action, status, details, execution_time 
+    FROM test_case_results 
+    WHERE test_file_id = ? 
+    ORDER BY id
+"""
+
+SQL_UPSERT_SETTING = """
+    INSERT OR REPLACE INTO settings (key, value, updated_at)
+    VALUES (?, ?, datetime('now'))
+"""
+
+SQL_SELECT_ALL_SETTINGS = "SELECT key, value FROM settings"
+
+SQL_UPSERT_TEMP_FILE = "INSERT OR REPLACE INTO temp_files (path, created_at) VALUES (?, ?)"
+
+SQL_SELECT_STALE_TEMP_FILES = "SELECT path FROM temp_files WHERE created_at < ?"
+
+SQL_DELETE_TEMP_FILE = "DELETE FROM temp_files WHERE path = ?"
+
+# History filter clauses; values are always passed as bound parameters
+DATE_FILTERS = {
+    "Today": "timestamp >= date('now')",
+    "Last 7 Days": "timestamp >= datetime('now', '-7 days')",
+    "Last 30 Days": "timestamp >= datetime('now', '-30 days')",
+}
+
+STATUS_FILTERS = {
+    "Pass": ("overall_result = ?", "Pass"),
+    "Fail": ("overall_result = ?", "Fail"),
+    "Error": ("send_status = ?", "Error"),
+}
 
 class TestDatabase:
     def __init__(self, db_path: str = "data/history.db"):
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
+        self._conn: Optional[sqlite3.Connection] = None  # Shared by all threads, guarded by _lock
+        self._lock = threading.RLock()
+        self._closed = False  # Set by close(); later calls fail instead of reopening the connection
+        self._settings_cache: Optional[Dict[str, str]] = None  # Loaded on first read, kept in step by saves
         self.ensure_database_exists()
     
     def ensure_database_exists(self):
@@ -19,7 +93,8 @@ class TestDatabase:
             # Create directory if needed
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
                 self.create_default_schema(conn)
                 conn.commit()
                 self.logger.info(f"Database initialized: {self.db_path}")
@@ -27,8 +102,43 @@ class TestDatabase:
         except Exception as e:
             self.logger.error(f"Database initialization error: {e}")
             # Don't raise - create in-memory fallback
+            self._drop_connection()
             self.db_path = ":memory:"
     
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open the shared connection with the performance pragmas applied"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-16384")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Use the shared connection; callers are serialized and the transaction is committed or rolled back on exit"""
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Database is closed")
+            if self._conn is None:
+                self._conn = self._open_connection()
+            with self._conn:
+                yield self._conn
+    
+    def close(self):
+        """Close the shared connection for good; waits for a call that is using it to finish"""
+        with self._lock:
+            self._closed = True
+            self._drop_connection()
+    
+    def _drop_connection(self):
+        """Close the shared connection; the next call opens a new one"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
     def create_default_schema(self, conn):
         """Create default database schema"""
         conn.executescript("""
@@ -72,16 +182,27 @@ class TestDatabase:
                 value TEXT NOT NULL,
                 updated_at TEXT NOT NULL DEFAULT (datetime('now'))
             );
+
+            CREATE TABLE IF NOT EXISTS temp_files (
+                path TEXT PRIMARY KEY,
+                created_at REAL NOT NULL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_test_files_result
+                ON test_files (overall_result, timestamp);
+
+            CREATE INDEX IF NOT EXISTS idx_test_files_timestamp
+                ON test_files (timestamp);
+
+            CREATE INDEX IF NOT EXISTS idx_temp_files_created
+                ON temp_files (created_at);
         """)
     
     def log_connection(self, target_ip: str, status: str, details: str = "", connection_type: str = "LAN"):
         """Log a connection event"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT INTO connection_log (target_ip, connection_type, status, details)
-                    VALUES (?, ?, ?, ?)
-                """, (target_ip, connection_type, status, details))
+            with self._connect() as conn:
+                conn.execute(SQL_INSERT_CONNECTION_LOG, (target_ip, connection_type, status, details))
                 conn.commit()
         except Exception as e:
             self.logger.error(f"Error logging connection: {e}")
@@ -94,14 +215,11 @@ class TestDatabase:
         Save test file result and return the file ID
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("""
-                    INSERT INTO test_files 
-                    (file_name, file_size, test_count, send_status, overall_result, 
-                     affects_wan, affects_lan, execution_time, target_ip, target_username)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (file_name, file_size, test_count, send_status, overall_result,
-                      int(affects_wan), int(affects_lan), execution_time, target_ip, target_username))
+            with self._connect() as conn:
+                cursor = conn.execute(SQL_INSERT_TEST_FILE, (
+                    file_name, file_size, test_count, send_status, overall_result,
+                    int(affects_wan), int(affects_lan), execution_time, target_ip, target_username
+                ))
                 
                 file_id = cursor.lastrowid
                 conn.commit()
@@ -114,34 +232,55 @@ class TestDatabase:
     def save_test_case_results(self, test_file_id: int, test_results: List[Dict[str, Any]]):
         """Save individual test case results"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                for result in test_results:
-                    conn.execute("""
-                        INSERT INTO test_case_results 
-                        (test_file_id, service, action, status, details, execution_time)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (
-                        test_file_id,
-                        result.get("service", ""),
-                        result.get("action", ""),
-                        result.get("status", ""),
-                        result.get("details", ""),
-                        result.get("execution_time", 0.0)
-                    ))
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(SQL_INSERT_TEST_CASE_RESULT, self._test_case_rows(test_file_id, test_results))
                 conn.commit()
         except Exception as e:
             self.logger.error(f"Error saving test case results: {e}")
     
+    def save_test_file_with_results(self, file_name: str, file_size: int, test_count: int,
+                                    send_status: str, overall_result: str, affects_wan: bool,
+                                    affects_lan: bool, execution_time: float, target_ip: str,
+                                    target_username: str, test_results: List[Dict[str, Any]]) -> int:
+        """
+        Save a test file result and its test case results in one transaction and return the file ID
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                cursor = conn.execute(SQL_INSERT_TEST_FILE, (
+                    file_name, file_size, test_count, send_status, overall_result,
+                    int(affects_wan), int(affects_lan), execution_time, target_ip, target_username
+                ))
+                
+                file_id = cursor.lastrowid
+                conn.executemany(SQL_INSERT_TEST_CASE_RESULT, self._test_case_rows(file_id, test_results))
+                conn.commit()
+                return file_id
+                
+        except Exception as e:
+            self.logger.error(f"Error saving test file result: {e}")
+            return -1
+    
+    @staticmethod
+    def _test_case_rows(test_file_id: int, test_results: List[Dict[str, Any]]) -> Iterator[Tuple]:
+        """Rows for SQL_INSERT_TEST_CASE_RESULT"""
+        for result in test_results:
+            yield (
+                test_file_id,
+                result.get("service", ""),
+                result.get("action", ""),
+                result.get("status", ""),
+                result.get("details", ""),
+                result.get("execution_time", 0.0)
+            )
+    
     def get_recent_history(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get recent test history"""
+        """Get recent test history rows for the history table"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute("""
-                    SELECT * FROM test_files 
-                    ORDER BY timestamp DESC 
-                    LIMIT ?
-                """, (limit,))
+            with self._connect() as conn:
+                cursor = conn.execute(SQL_SELECT_RECENT_HISTORY, (limit,))
                 
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows]
@@ -150,25 +289,115 @@ class TestDatabase:
             self.logger.error(f"Error getting history: {e}")
             return []
     
+    def get_filtered_history(self, date_filter: str = "All", status_filter: str = "All",
+                             limit: int = 100) -> List[Dict[str, Any]]:
+        """Get test history filtered by date range and result status"""
+        clauses = []
+        params: List[Any] = []
+        
+        if date_filter in DATE_FILTERS:
+            clauses.append(DATE_FILTERS[date_filter])
+        
+        if status_filter in STATUS_FILTERS:
+            clause, value = STATUS_FILTERS[status_filter]
+            clauses.append(clause)
+            params.append(value)
+        elif status_filter and status_filter != "All":
+            clauses.append("overall_result LIKE ? ESCAPE '\\'")
+            escaped = status_filter.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        
+        if not clauses:
+            return self.get_recent_history(limit)
+        
+        params.append(limit)
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(SQL_SELECT_FILTERED_HISTORY.format(where=" AND ".join(clauses)), params)
+                return [dict(row) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            self.logger.error(f"Error getting filtered history: {e}")
+            return []
+    
+    def get_test_details(self, test_file_id: int) -> List[Dict[str, Any]]:
+        """Get individual test case results for a test file"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(SQL_SELECT_TEST_CASE_RESULTS, (test_file_id,))
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            self.logger.error(f"Error getting test details: {e}")
+            return []
+    
     def save_setting(self, key: str, value: str):
         """Save an application setting"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO settings (key, value, updated_at)
-                    VALUES (?, ?, datetime('now'))
-                """, (key, value))
+            with self._connect() as conn:
+                conn.execute(SQL_UPSERT_SETTING, (key, value))
                 conn.commit()
+                if self._settings_cache is not None:
+                    self._settings_cache[key] = value
         except Exception as e:
             self.logger.error(f"Error saving setting: {e}")
     
+    def save_settings(self, settings: Dict[str, str]):
+        """Save several application settings in a single transaction"""
+        if not settings:
+            return
+        
+        try:
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(SQL_UPSERT_SETTING, settings.items())
+                conn.commit()
+                if self._settings_cache is not None:
+                    self._settings_cache.update(settings)
+        except Exception as e:
+            self.logger.error(f"Error saving settings: {e}")
+    
+    def record_temp_file(self, path: str, created_at: float):
+        """Track a downloaded temporary file so cleanup doesn't need to scan the directory"""
+        try:
+            with self._connect() as conn:
+                conn.execute(SQL_UPSERT_TEMP_FILE, (path, created_at))
+                conn.commit()
+        except Exception as e:
+            self.logger.error(f"Error recording temp file: {e}")
+    
+    def get_stale_temp_files(self, cutoff: float) -> List[str]:
+        """Return tracked temporary files created before the cutoff time"""
+        try:
+            with self._connect() as conn:
+                return [row[0] for row in conn.execute(SQL_SELECT_STALE_TEMP_FILES, (cutoff,))]
+        except Exception as e:
+            self.logger.error(f"Error reading stale temp files: {e}")
+            return []
+    
+    def forget_temp_files(self, paths: List[str]):
+        """Stop tracking temporary files that have been removed"""
+        if not paths:
+            return
+        
+        try:
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(SQL_DELETE_TEMP_FILE, ((path,) for path in paths))
+                conn.commit()
+        except Exception as e:
+            self.logger.error(f"Error forgetting temp files: {e}")
+    
     def get_setting(self, key: str, default: str = "") -> str:
-        """Get an application setting"""
+        """Get an application setting from the settings cache"""
+        return self.get_settings().get(key, default)
+    
+    def get_settings(self) -> Dict[str, str]:
+        """Get all application settings; the table is read once, later calls are served from memory"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("SELECT value FROM settings WHERE key = ?", (key,))
-                row = cursor.fetchone()
-                return row[0] if row else default
+            with self._connect() as conn:
+                if self._settings_cache is None:
+                    self._settings_cache = {row[0]: row[1] for row in conn.execute(SQL_SELECT_ALL_SETTINGS)}
+                return dict(self._settings_cache)
         except Exception as e:
-            self.logger.error(f"Error getting setting: {e}")
-            return default
\ No newline at end of file
+            self.logger.error(f"Error getting settings: {e}")
+            return {}
\ No newline at end of file
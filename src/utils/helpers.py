@@ -0,0 +1,51 @@
+# Module: helpers.py
+# Purpose: Shared helpers used across modules
+
+import json
+import mmap
+from datetime import datetime
+from typing import Tuple
+
+# Prefer the fastest available JSON parser: orjson, then ujson, then stdlib.
+# All three accept bytes. JSON_DECODE_ERRORS covers the decode errors they raise.
+try:
+    import orjson
+    json_loads = orjson.loads
+    JSON_DECODE_ERRORS = (json.JSONDecodeError,)  # orjson.JSONDecodeError subclasses it
+except ImportError:
+    orjson = None
+    try:
+        import ujson
+        json_loads = ujson.loads
+        JSON_DECODE_ERRORS = (json.JSONDecodeError, ujson.JSONDecodeError)
+    except ImportError:
+        ujson = None
+        json_loads = json.loads
+        JSON_DECODE_ERRORS = (json.JSONDecodeError,)
+
+def load_json_file(path: str):
+    """Parse a JSON file; with orjson the file is mapped and parsed in place instead of read into a copy"""
+    with open(path, 'rb') as f:
+        if orjson is not None:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                pass  # Empty files can't be mapped; read() gives the parser's own error
+            else:
+                with mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+        return json_loads(f.read())
+
+_SIZE_UNITS = ("KB", "MB", "GB", "TB")
+
+def format_file_size(size: int) -> str:
+    """Format a byte count as KB/MB/GB/TB, picking the unit from the bit length"""
+    exponent = (size.bit_length() - 1) // 10 if size else 0
+    exponent = min(max(exponent, 1), len(_SIZE_UNITS))  # Sizes below 1 KB still show as KB
+    return f"{size / (1 << (10 * exponent)):.1f} {_SIZE_UNITS[exponent - 1]}"
+
+def timestamp_parts() -> Tuple[str, str]:
+    """Return the current local (date, time) as 'YYYY-MM-DD', 'HH:MM:SS' without strftime"""
+    now = datetime.now()
+    return (f"{now.year:04d}-{now.month:02d}-{now.day:02d}",
+            f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}")
@@ -0,0 +1,7 @@
+# Module: conftest.py
+# Purpose: Make the application modules under src/ importable the way main.py sees them
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
@@ -0,0 +1,49 @@
+# Module: test_connection.py
+# Purpose: Tests for parsing the end markers of commands run in the persistent shell
+
+import pytest
+
+pytest.importorskip("paramiko")
+
+from network.connection import _parse_marked_output  # noqa: E402
+
+MARKER = "__END_0123abcd__"
+STDOUT = f"line one\nline two\n\n{MARKER} 127\n".encode()
+STDERR = f"warning\n\n{MARKER}\n".encode()
+
+
+def test_parse_complete_output():
+    assert _parse_marked_output(STDOUT, STDERR, MARKER) == (127, b"line one\nline two\n", b"warning\n")
+
+
+def test_parse_empty_output():
+    stdout = f"\n{MARKER} 0\n".encode()
+    stderr = f"\n{MARKER}\n".encode()
+    assert _parse_marked_output(stdout, stderr, MARKER) == (0, b"", b"")
+
+
+@pytest.mark.parametrize("split", range(len(STDOUT)))
+def test_parse_waits_for_split_stdout(split):
+    # Every prefix of stdout is incomplete, including one cut after the space or inside "127"
+    assert _parse_marked_output(STDOUT[:split], STDERR, MARKER) is None
+
+
+@pytest.mark.parametrize("split", range(len(STDERR)))
+def test_parse_waits_for_split_stderr(split):
+    assert _parse_marked_output(STDOUT, STDERR[:split], MARKER) is None
+
+
+def test_parse_accumulated_chunks():
+    # Reads arrive in small pieces; parsing only succeeds once both streams are complete
+    stdout = b""
+    results = []
+    for i in range(0, len(STDOUT), 3):
+        stdout += STDOUT[i:i + 3]
+        results.append(_parse_marked_output(stdout, STDERR, MARKER))
+    assert results[:-1] == [None] * (len(results) - 1)
+    assert results[-1] == (127, b"line one\nline two\n", b"warning\n")
+
+
+def test_parse_ignores_marker_text_without_status():
+    stdout = f"echo {MARKER}\n".encode()
+    assert _parse_marked_output(stdout, STDERR, MARKER) is None
@@ -0,0 +1,99 @@
+# Module: test_database.py
+# Purpose: Tests for the SQLite history, settings and temp file storage
+
+import sqlite3
+
+import pytest
+
+from storage import database
+
+
+@pytest.fixture
+def db(tmp_path):
+    test_db = database.TestDatabase(str(tmp_path / "history.db"))
+    yield test_db
+    test_db.close()
+
+
+def save_file(db, name, overall_result, send_status="Completed", results=()):
+    return db.save_test_file_with_results(
+        name, 100, len(results), send_status, overall_result, False, False, 1.5,
+        "192.168.1.1", "root", list(results))
+
+
+def test_save_test_file_with_results(db):
+    results = [
+        {"service": "wan", "action": "create", "status": "Pass", "details": "ok", "execution_time": 0.5},
+        {"service": "ping", "status": "Fail"},
+    ]
+    file_id = save_file(db, "wan_create.json", "Fail", results=results)
+    assert file_id > 0
+    
+    details = db.get_test_details(file_id)
+    assert [(row["service"], row["action"], row["status"]) for row in details] == [
+        ("wan", "create", "Pass"), ("ping", "", "Fail")]
+    
+    history = db.get_recent_history()
+    assert [(row["id"], row["file_name"], row["test_count"]) for row in history] == [(file_id, "wan_create.json", 2)]
+
+
+def test_filtered_history(db):
+    save_file(db, "a.json", "Pass")
+    save_file(db, "b.json", "Fail")
+    save_file(db, "c.json", "Fail", send_status="Error")
+    save_file(db, "d.json", "Partial_100%")
+    
+    def names(**filters):
+        return sorted(row["file_name"] for row in db.get_filtered_history(**filters))
+    
+    assert names() == ["a.json", "b.json", "c.json", "d.json"]
+    assert names(status_filter="Pass") == ["a.json"]
+    assert names(status_filter="Fail") == ["b.json", "c.json"]
+    assert names(status_filter="Error") == ["c.json"]
+    assert names(date_filter="Today", status_filter="Pass") == ["a.json"]
+    assert names(date_filter="Last 7 Days") == ["a.json", "b.json", "c.json", "d.json"]
+    # Free-text filters match literally, with LIKE wildcards escaped
+    assert names(status_filter="_100%") == ["d.json"]
+    assert names(status_filter="%") == ["d.json"]
+    assert names(status_filter="a_") == []
+    assert len(db.get_filtered_history(limit=2)) == 2
+
+
+def test_settings_cache(db, tmp_path):
+    assert db.get_setting("lan_ip", "none") == "none"
+    db.save_setting("lan_ip", "192.168.1.1")
+    db.save_settings({"username": "root", "lan_ip": "10.0.0.1"})
+    assert db.get_settings() == {"lan_ip": "10.0.0.1", "username": "root"}
+    
+    # Callers get a copy, not the cache itself
+    db.get_settings()["username"] = "changed"
+    assert db.get_setting("username") == "root"
+    
+    # Saved values are in the table, not only in the cache
+    reopened = database.TestDatabase(db.db_path)
+    try:
+        assert reopened.get_settings() == {"lan_ip": "10.0.0.1", "username": "root"}
+    finally:
+        reopened.close()
+
+
+def test_temp_files(db):
+    db.record_temp_file("/tmp/old.json", 100.0)
+    db.record_temp_file("/tmp/new.json", 300.0)
+    db.record_temp_file("/tmp/old.json", 150.0)  # Re-recording replaces the entry
+    
+    assert db.get_stale_temp_files(200.0) == ["/tmp/old.json"]
+    db.forget_temp_files(["/tmp/old.json"])
+    assert db.get_stale_temp_files(200.0) == []
+    assert db.get_stale_temp_files(400.0) == ["/tmp/new.json"]
+
+
+def test_closed_database(db):
+    db.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        with db._connect():
+            pass
+    # Public methods log and return their empty value instead of reopening
+    assert db.save_test_file_result("a.json", 1, 1, "Completed", "Pass", False, False, 1.0, "ip", "root") == -1
+    assert db.get_recent_history() == []
+    assert db._conn is None
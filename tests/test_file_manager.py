@@ -0,0 +1,77 @@
+# Module: test_file_manager.py
+# Purpose: Tests for JSON test case validation and its parse cache
+
+import json
+import os
+
+from files import manager
+
+
+def write_cases(path, cases):
+    path.write_text(json.dumps({"test_cases": cases}), encoding="utf-8")
+
+
+def test_validate_json_file(tmp_path):
+    path = tmp_path / "wan_create.json"
+    write_cases(path, [{"service": "wan", "action": "create"}])
+    is_valid, error, data = manager.TestFileManager().validate_json_file(str(path))
+    assert (is_valid, error) == (True, "")
+    assert data["test_cases"][0]["service"] == "wan"
+
+
+def test_validate_json_file_errors(tmp_path):
+    file_manager = manager.TestFileManager()
+    
+    assert file_manager.validate_json_file(str(tmp_path / "missing.json"))[:2] == (False, "File does not exist")
+    
+    empty = tmp_path / "empty.json"
+    empty.write_bytes(b"")
+    assert file_manager.validate_json_file(str(empty))[:2] == (False, "File is empty")
+    
+    broken = tmp_path / "broken.json"
+    broken.write_bytes(b"{")
+    is_valid, error, _ = file_manager.validate_json_file(str(broken))
+    assert not is_valid and error.startswith("Invalid JSON format")
+    
+    no_service = tmp_path / "no_service.json"
+    write_cases(no_service, [{"action": "create"}])
+    assert file_manager.validate_json_file(str(no_service))[:2] == (False, "Test case #0 missing 'service' field")
+
+
+def test_parse_cache_reuses_unchanged_file(tmp_path, monkeypatch):
+    path = tmp_path / "ping.json"
+    write_cases(path, [{"service": "ping"}])
+    calls = []
+    monkeypatch.setattr(manager, "load_json_file", lambda p: calls.append(p) or json.loads(open(p).read()))
+    
+    file_manager = manager.TestFileManager()
+    first = file_manager.validate_json_file(str(path))[2]
+    second = file_manager.validate_json_file(str(path))[2]
+    assert len(calls) == 1
+    assert second is first
+
+
+def test_parse_cache_reloads_changed_file(tmp_path):
+    path = tmp_path / "ping.json"
+    write_cases(path, [{"service": "ping"}])
+    file_manager = manager.TestFileManager()
+    assert file_manager.validate_json_file(str(path))[2]["test_cases"][0]["service"] == "ping"
+    
+    # Same size, newer mtime: the cached result must not be used
+    write_cases(path, [{"service": "pong"}])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert file_manager.validate_json_file(str(path))[2]["test_cases"][0]["service"] == "pong"
+
+
+def test_parse_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(manager.TestFileManager, "PARSE_CACHE_SIZE", 3)
+    file_manager = manager.TestFileManager()
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"case_{i}.json"
+        write_cases(path, [{"service": "ping"}])
+        paths.append(str(path))
+        file_manager.validate_json_file(str(path))
+    
+    assert list(file_manager._parse_cache) == paths[-3:]
@@ -0,0 +1,53 @@
+# Module: test_helpers.py
+# Purpose: Tests for the shared helpers in utils/helpers.py
+
+import json
+import re
+
+import pytest
+
+from utils.helpers import JSON_DECODE_ERRORS, format_file_size, load_json_file, timestamp_parts
+
+
+@pytest.mark.parametrize("size, expected", [
+    (0, "0.0 KB"),
+    (1, "0.0 KB"),
+    (512, "0.5 KB"),
+    (1023, "1.0 KB"),
+    (1024, "1.0 KB"),
+    (1536, "1.5 KB"),
+    (1024 * 1024 - 1, "1024.0 KB"),
+    (1024 * 1024, "1.0 MB"),
+    (5 * 1024 ** 3, "5.0 GB"),
+    (3 * 1024 ** 4, "3.0 TB"),
+    (2048 * 1024 ** 4, "2048.0 TB"),
+])
+def test_format_file_size(size, expected):
+    assert format_file_size(size) == expected
+
+
+def test_timestamp_parts_format():
+    date_part, time_part = timestamp_parts()
+    assert re.fullmatch(r"\d{4}-\d{2}-\d{2}", date_part)
+    assert re.fullmatch(r"\d{2}:\d{2}:\d{2}", time_part)
+
+
+def test_load_json_file(tmp_path):
+    data = {"test_cases": [{"service": "wan", "action": "create", "note": "xé"}]}
+    path = tmp_path / "case.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    assert load_json_file(str(path)) == data
+
+
+def test_load_json_file_empty(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_bytes(b"")
+    with pytest.raises(JSON_DECODE_ERRORS):
+        load_json_file(str(path))
+
+
+def test_load_json_file_invalid(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_bytes(b'{"test_cases": [')
+    with pytest.raises(JSON_DECODE_ERRORS):
+        load_json_file(str(path))
@@ -0,0 +1,36 @@
+# Module: test_ip_pattern.py
+# Purpose: Tests for the LAN IP address check used by connection field validation
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from gui.interface import ApplicationGUI  # noqa: E402
+
+
+@pytest.mark.parametrize("address", [
+    "192.168.1.1",
+    "0.0.0.0",
+    "255.255.255.255",
+    "10.0.0.254",
+    "192.168.001.010",
+])
+def test_valid_addresses(address):
+    assert ApplicationGUI.IP_PATTERN.fullmatch(address)
+
+
+@pytest.mark.parametrize("address", [
+    "",
+    "192.168.1",
+    "192.168.1.1.1",
+    "256.1.1.1",
+    "192.168.1.300",
+    "192.168.1.",
+    "192.168..1",
+    "192.168.1.a",
+    " 192.168.1.1",
+    "192.168.1.1\n",
+    "-1.0.0.0",
+])
+def test_invalid_addresses(address):
+    assert not ApplicationGUI.IP_PATTERN.fullmatch(address)